@@ -2,9 +2,44 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from . import websocket_api
+from .const import (
+    CONF_BOILER_ENTITY_ID,
+    CONF_DEMAND_THRESHOLD,
+    CONF_HELPER_TYPE,
+    CONF_MIN_CYCLE_DURATION,
+    DOMAIN,
+    HELPER_TYPE_HEAT_DEMAND,
+    HELPER_TYPE_THERMOSTAT,
+)
+from .demand import BoilerSwitch, async_get_heat_demand
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PLATFORMS: dict[str, tuple[Platform, ...]] = {
+    HELPER_TYPE_THERMOSTAT: (Platform.CLIMATE,),
+    HELPER_TYPE_HEAT_DEMAND: (Platform.SENSOR,),
+}
+
+
+def _get_platforms(entry: ConfigEntry) -> tuple[Platform, ...]:
+    """Return the platforms of a config entry."""
+    # Entries created before heat demand helpers existed have no helper type
+    return PLATFORMS[entry.options.get(CONF_HELPER_TYPE, HELPER_TYPE_THERMOSTAT)]
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Thermostat Valve Controller integration."""
+    websocket_api.async_setup(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -14,7 +49,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # TODO Optionally validate config entry options before setting up platform
 
-    await hass.config_entries.async_forward_entry_setups(entry, (Platform.CLIMATE,))
+    await hass.config_entries.async_forward_entry_setups(entry, _get_platforms(entry))
+
+    if boiler_entity_id := entry.options.get(CONF_BOILER_ENTITY_ID):
+        boiler = BoilerSwitch(
+            hass,
+            async_get_heat_demand(hass),
+            boiler_entity_id,
+            entry.options.get(CONF_DEMAND_THRESHOLD, 0),
+            timedelta(**min_cycle_duration_dict)
+            if (min_cycle_duration_dict := entry.options.get(CONF_MIN_CYCLE_DURATION))
+            else None,
+        )
+        entry.async_on_unload(boiler.async_start())
 
     # TODO Remove if the integration does not have an options flow
     entry.async_on_unload(entry.add_update_listener(config_entry_update_listener))
@@ -30,4 +77,6 @@ async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry)
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, (Platform.CLIMATE,))
+    return await hass.config_entries.async_unload_platforms(
+        entry, _get_platforms(entry)
+    )
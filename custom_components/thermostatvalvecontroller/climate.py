@@ -1,9 +1,14 @@
 """Climate platform for the Thermostat Valve Controller integration."""
 
+from array import array
 import asyncio
 import logging
 import math
+import time
 from datetime import timedelta, datetime
+from typing import Any
+
+import voluptuous as vol
 
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
@@ -27,14 +32,15 @@ from homeassistant.core import (
     Event,
     EventStateChangedData,
     CoreState,
+    SupportsResponse,
 )
-from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import entity_platform, entity_registry as er
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.device import async_device_info_to_link_from_entity
 from homeassistant.helpers.event import (
     async_track_state_change_event,
 )
-from homeassistant.exceptions import ConditionError
+from homeassistant.exceptions import ConditionError, HomeAssistantError
 from homeassistant.helpers import condition
 from homeassistant.helpers.restore_state import RestoreEntity
 
@@ -42,6 +48,7 @@ from .const import (
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     CONF_POSITION_MAPPING,
+    CONF_PRESET_POSITION_MAPPINGS,
     CONF_PRECISION,
     CONF_PRESETS,
     CONF_TARGET_TEMP_STEP,
@@ -50,7 +57,27 @@ from .const import (
     CONF_MIN_CYCLE_DURATION,
     CONF_VALVE_EMERGENCY_POSITION,
     CONF_MIN_TEMP_CHANGE_STEP,
+    CONF_ADAPTIVE_TIMING,
+    CONF_SCHEDULE,
+    ATTR_COUNT,
+    ATTR_VALVE_LATENCY_P50,
+    ATTR_VALVE_LATENCY_P95,
+    ATTR_VALVE_LATENCY_SAMPLES,
+    ADAPTIVE_CYCLE_LATENCY_FACTOR,
+    ADAPTIVE_MIN_SAMPLES,
+    ADAPTIVE_WRITE_TIMEOUT_LATENCY_FACTOR,
+    ADAPTIVE_WRITE_TIMEOUT_MAX,
+    ADAPTIVE_WRITE_TIMEOUT_MIN,
+    SERVICE_DUMP_TRACE,
+    TRACE_BUFFER_SIZE,
 )
+from .demand import async_get_heat_demand
+from .latency import ValveLatencyTracker
+from .mapping import compile_mapping
+from .models import ControllerConfig, ControllerState
+from .schedule import CompiledSchedule, async_get_schedule_engine, compile_schedule
+from .telemetry import async_get_telemetry
+from .trace import DecisionTrace, TraceResult
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -89,6 +116,7 @@ async def async_setup_entry(
     )
     target_temp_step: float | None = config_entry.options.get(CONF_TARGET_TEMP_STEP)
     min_temp_change_step: float = config_entry.options.get(CONF_MIN_TEMP_CHANGE_STEP, 0)
+    adaptive_timing: bool = config_entry.options.get(CONF_ADAPTIVE_TIMING, False)
     unit = hass.config.units.temperature_unit
     presets: dict[str, float] = {
         key: config_entry.options[value]
@@ -96,6 +124,14 @@ async def async_setup_entry(
         if value in config_entry.options
     }
 
+    try:
+        schedule: CompiledSchedule | None = compile_schedule(
+            config_entry.options.get(CONF_SCHEDULE, {})
+        )
+    except ValueError as err:
+        _LOGGER.error("Invalid schedule, the schedule will not be used: %s", err)
+        schedule = None
+
     # TODO add more and better validation
 
     # Validate valve position mapping
@@ -105,10 +141,44 @@ async def async_setup_entry(
         )
         return
 
-    # convert mapping keys to float and values to float
-    converted_valve_position_mapping = {
-        float(k): float(v) for k, v in valve_position_mapping.items()
-    }
+    # Compile the mappings once, switching presets then only swaps the curve
+    try:
+        valve_curve = compile_mapping(valve_position_mapping)
+    except ValueError as err:
+        _LOGGER.error("Invalid valve position mapping: %s", err)
+        return
+
+    preset_position_mappings = config_entry.options.get(
+        CONF_PRESET_POSITION_MAPPINGS, {}
+    )
+    preset_valve_curves = []
+    for preset in presets:
+        if (mapping := preset_position_mappings.get(preset)) is None:
+            preset_valve_curves.append(None)
+            continue
+        try:
+            preset_valve_curves.append(compile_mapping(mapping))
+        except ValueError as err:
+            _LOGGER.error(
+                "Invalid valve position mapping for preset %s, using the default mapping: %s",
+                preset,
+                err,
+            )
+            preset_valve_curves.append(None)
+
+    config = ControllerConfig(
+        valve_entity_id=valve_entity_id,
+        temp_sensor_entity_id=temp_sensor_entity_id,
+        valve_curve=valve_curve,
+        preset_names=tuple(presets),
+        preset_temps=array("d", presets.values()),
+        preset_valve_curves=tuple(preset_valve_curves),
+        min_cycle_duration=min_cycle_duration,
+        valve_emergency_position=valve_emergency_position,
+        min_temp_change_step=min_temp_change_step,
+        adaptive_timing=adaptive_timing,
+        schedule=schedule,
+    )
 
     async_add_entities(
         [
@@ -116,22 +186,24 @@ async def async_setup_entry(
                 hass=hass,
                 name=name,
                 unique_id=unique_id,
-                valve_entity_id=valve_entity_id,
-                valve_position_mapping=converted_valve_position_mapping,
-                temp_sensor_entity_id=temp_sensor_entity_id,
+                config=config,
                 min_temp=min_temp,
                 max_temp=max_temp,
                 precision=precision,
-                min_cycle_duration=min_cycle_duration,
-                valve_emergency_position=valve_emergency_position,
                 target_temp_step=target_temp_step,
-                min_temp_change_step=min_temp_change_step,
                 unit=unit,
-                presets=presets,
             )
         ]
     )
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_DUMP_TRACE,
+        {vol.Optional(ATTR_COUNT): vol.All(vol.Coerce(int), vol.Range(min=1))},
+        "async_dump_trace",
+        supports_response=SupportsResponse.ONLY,
+    )
+
 
 class ValveControllerClimate(ClimateEntity, RestoreEntity):
     """Representation of a Thermostat Valve Controller."""
@@ -139,33 +211,30 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
     _attr_should_poll = False
     _attr_has_entity_name = True
     _attr_hvac_modes = [HVACMode.HEAT, HVACMode.OFF]
+    _unrecorded_attributes = frozenset(
+        {ATTR_VALVE_LATENCY_P50, ATTR_VALVE_LATENCY_P95, ATTR_VALVE_LATENCY_SAMPLES}
+    )
 
     def __init__(
         self,
         hass: HomeAssistant,
         name: str,
         unique_id: str,
-        valve_entity_id: str,
-        valve_position_mapping: dict[float, float],
-        temp_sensor_entity_id: str,
+        config: ControllerConfig,
         min_temp: float | None,
         max_temp: float | None,
         precision: float | None,
-        min_cycle_duration: timedelta | None,
-        valve_emergency_position: float | None,
         target_temp_step: float | None,
-        min_temp_change_step: float,
         unit: UnitOfTemperature,
-        presets: dict[str, float],
     ) -> None:
         """Initialize the climate entity."""
         # super().__init__()
 
         # Entity Attributes
         self._attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
-        if len(presets):
+        if len(config.preset_names):
             self._attr_supported_features |= ClimateEntityFeature.PRESET_MODE
-            self._attr_preset_modes = [PRESET_NONE, *presets.keys()]
+            self._attr_preset_modes = [PRESET_NONE, *config.preset_names]
         else:
             self._attr_preset_modes = [PRESET_NONE]
 
@@ -173,7 +242,7 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
 
         self._attr_device_info = async_device_info_to_link_from_entity(
             hass,
-            valve_entity_id,
+            config.valve_entity_id,
         )
         self._attr_name = name
         self._attr_unique_id = unique_id
@@ -193,25 +262,17 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
         self._attr_temperature_unit = unit
 
         # Other values
-        self._valve_entity_id = valve_entity_id
-        self._temp_sensor_entity_id = temp_sensor_entity_id
-        self._min_cycle_duration = min_cycle_duration
-        self._valve_emergency_position = valve_emergency_position
-        self._target_temp = next(iter(presets.values()), None)
-        self._saved_target_temp = next(iter(presets.values()), None)
-        self._current_temp: float | None = None
-        self._hvac_mode: HVACMode | None = None
-        self._pending_update_task: asyncio.Task | None = None
-        self._min_temp_change_step = min_temp_change_step
-        self._last_valve_update_temp: float | None = None
-
-        self._valve_position_mapping = valve_position_mapping
-        self._sorted_valve_mapping_keys = sorted(self._valve_position_mapping.keys())
-        self._min_valve_position = min(self._valve_position_mapping.values())
-        self._max_valve_position = max(self._valve_position_mapping.values())
-
-        self._presets = presets
-        self._presets_inv = {v: k for k, v in presets.items()}
+        self._config = config
+        first_preset_temp = config.preset_temps[0] if config.preset_temps else None
+        self._runtime = ControllerState(
+            valve_curve=config.valve_curve,
+            target_temp=first_preset_temp,
+            saved_target_temp=first_preset_temp,
+        )
+        self._trace = DecisionTrace(TRACE_BUFFER_SIZE)
+        self._valve_latency = ValveLatencyTracker(ADAPTIVE_WRITE_TIMEOUT_MAX)
+        self._heat_demand = async_get_heat_demand(hass)
+        self._telemetry = async_get_telemetry(hass)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
@@ -220,26 +281,42 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
         # Add listener
         self.async_on_remove(
             async_track_state_change_event(
-                self.hass, [self._temp_sensor_entity_id], self._async_sensor_changed
+                self.hass,
+                [self._config.temp_sensor_entity_id],
+                self._async_sensor_changed,
             )
         )
         self.async_on_remove(
             async_track_state_change_event(
-                self.hass, [self._valve_entity_id], self._async_valve_changed
+                self.hass, [self._config.valve_entity_id], self._async_valve_changed
             )
         )
 
+        self.async_on_remove(
+            self._telemetry.async_register(self.entity_id, self._telemetry_snapshot)
+        )
+
+        # Follow the schedule
+        schedule = self._config.schedule
+        if schedule is not None and schedule.offsets:
+            self.async_on_remove(
+                async_get_schedule_engine(self.hass).async_add(
+                    schedule, self._async_scheduled_preset
+                )
+            )
+
         @callback
         def _async_startup(_: Event | None = None) -> None:
             """Init on startup."""
-            sensor_state = self.hass.states.get(self._temp_sensor_entity_id)
+            sensor_state = self.hass.states.get(self._config.temp_sensor_entity_id)
             if sensor_state and sensor_state.state not in (
                 STATE_UNAVAILABLE,
                 STATE_UNKNOWN,
             ):
                 self._async_update_temp(sensor_state)
 
-            valve_state = self.hass.states.get(self._valve_entity_id)
+            valve_state = self.hass.states.get(self._config.valve_entity_id)
+            self._async_update_heat_demand(valve_state)
             if valve_state and valve_state.state not in (
                 STATE_UNAVAILABLE,
                 STATE_UNKNOWN,
@@ -257,30 +334,37 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
         if (last_state := await self.async_get_last_state()) is not None:
             # Restore target temperature
             if last_state.attributes.get(ATTR_TEMPERATURE) is not None:
-                self._target_temp = float(last_state.attributes[ATTR_TEMPERATURE])
+                self._runtime.target_temp = float(
+                    last_state.attributes[ATTR_TEMPERATURE]
+                )
 
             # Restore HVAC mode
             if last_state.state is not None and last_state.state != STATE_UNKNOWN:
                 if last_state.state in [mode.value for mode in HVACMode]:
-                    self._hvac_mode = HVACMode(last_state.state)
+                    self._runtime.hvac_mode = HVACMode(last_state.state)
                 else:
-                    self._hvac_mode = HVACMode.OFF
+                    self._runtime.hvac_mode = HVACMode.OFF
 
             # Restore preset mode
             if (preset_mode := last_state.attributes.get("preset_mode")) is not None:
                 self._attr_preset_mode = preset_mode
-                if preset_mode != PRESET_NONE and preset_mode in self._presets:
-                    self._target_temp = self._presets[preset_mode]
+                if (
+                    preset_mode != PRESET_NONE
+                    and (temp := self._config.preset_temperature(preset_mode))
+                    is not None
+                ):
+                    self._runtime.target_temp = temp
             else:
                 self._attr_preset_mode = None
+            self._select_valve_curve()
 
         # Set default target temperature if still None
-        if self._target_temp is None:
-            self._target_temp = self.min_temp
+        if self._runtime.target_temp is None:
+            self._runtime.target_temp = self.min_temp
 
         # Set default hvac mode to off if still None
-        if self._hvac_mode not in self.hvac_modes:
-            self._hvac_mode = HVACMode.OFF
+        if self._runtime.hvac_mode not in self.hvac_modes:
+            self._runtime.hvac_mode = HVACMode.OFF
 
         self.async_write_ha_state()
 
@@ -298,15 +382,40 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
     def _async_valve_changed(self, event: Event[EventStateChangedData]) -> None:
         """Handle valve position state changes."""
         new_state = event.data["new_state"]
-        # old_state = event.data["old_state"]
+        old_state = event.data["old_state"]
         if new_state is None:
             return
+        if (
+            old_state is None or new_state.state != old_state.state
+        ) and self._async_update_heat_demand(new_state):
+            # The valve reported a new position, this may complete a pending write
+            self._valve_latency.complete(float(new_state.state))
         # if old_state is None:
         #     self.hass.async_create_task(
         #         self._check_switch_initial_state(), eager_start=True
         #     )
+        self._telemetry.async_publish(self.entity_id)
         self.async_write_ha_state()
 
+    @callback
+    def _async_update_heat_demand(self, valve_state: State | None) -> bool:
+        """Report the valve position to the heat demand, return if it was valid."""
+        try:
+            if valve_state is None:
+                raise ValueError("Valve entity does not exist")
+            position = float(valve_state.state)
+        except ValueError:
+            self._heat_demand.async_remove(self._attr_unique_id)
+            return False
+
+        self._heat_demand.async_update(
+            self._attr_unique_id,
+            position,
+            self._runtime.valve_curve.minimum,
+            self._runtime.valve_curve.maximum,
+        )
+        return True
+
     async def _check_valve_initial_state(self) -> None:
         """Sets the valve to the correct position on startup."""
         await self._async_control_heating(force=True)
@@ -314,13 +423,13 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
     @property
     def available(self) -> bool:
         """Return climate group availability."""
-        return self.hass.states.get(self._valve_entity_id) is not None
+        return self.hass.states.get(self._config.valve_entity_id) is not None
 
     # HVAC Mode
     @property
     def hvac_mode(self) -> HVACMode | None:
         """Return the current hvac mode."""
-        return self._hvac_mode
+        return self._runtime.hvac_mode
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
@@ -329,7 +438,7 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
                 f"Got unsupported hvac_mode {hvac_mode}. Must be one of {self.hvac_modes}"
             )
 
-        self._hvac_mode = hvac_mode
+        self._runtime.hvac_mode = hvac_mode
         await self._async_control_heating(force=True)
 
         # Update the state of the entity
@@ -341,7 +450,7 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
         if self._is_device_active:
             return HVACAction.HEATING
 
-        if self._hvac_mode == HVACMode.OFF:
+        if self._runtime.hvac_mode == HVACMode.OFF:
             return HVACAction.OFF
 
         return HVACAction.IDLE
@@ -349,20 +458,62 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
     @property
     def _is_device_active(self) -> bool | None:
         """If the valve is currently active/open."""
-        if not (valve_state := self.hass.states.get(self._valve_entity_id)):
+        if not (valve_state := self.hass.states.get(self._config.valve_entity_id)):
             return None
 
         try:
-            return float(valve_state.state) > float(self._min_valve_position)
+            return float(valve_state.state) > self._runtime.valve_curve.minimum
         except (ValueError, TypeError):
             _LOGGER.error("Failed to parse valve state: %s", valve_state.state)
             return None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the valve round-trip latency statistics."""
+        if not self._valve_latency.count:
+            return None
+        return {
+            ATTR_VALVE_LATENCY_P50: round(self._valve_latency.p50.value, 2),
+            ATTR_VALVE_LATENCY_P95: round(self._valve_latency.p95.value, 2),
+            ATTR_VALVE_LATENCY_SAMPLES: self._valve_latency.count,
+        }
+
+    @property
+    def _effective_min_cycle_duration(self) -> timedelta | None:
+        """Return the min cycle duration, stretched to the valve latency if adaptive."""
+        if (
+            not self._config.adaptive_timing
+            or self._valve_latency.count < ADAPTIVE_MIN_SAMPLES
+        ):
+            return self._config.min_cycle_duration
+
+        latency_cycle = timedelta(
+            seconds=self._valve_latency.p95.value * ADAPTIVE_CYCLE_LATENCY_FACTOR
+        )
+        if self._config.min_cycle_duration is None:
+            return latency_cycle
+        return max(self._config.min_cycle_duration, latency_cycle)
+
+    @property
+    def _write_timeout(self) -> float | None:
+        """Return the timeout for valve writes, or None to wait indefinitely."""
+        if not self._config.adaptive_timing:
+            return None
+        if self._valve_latency.count < ADAPTIVE_MIN_SAMPLES:
+            return ADAPTIVE_WRITE_TIMEOUT_MAX
+        return min(
+            max(
+                self._valve_latency.p95.value * ADAPTIVE_WRITE_TIMEOUT_LATENCY_FACTOR,
+                ADAPTIVE_WRITE_TIMEOUT_MIN,
+            ),
+            ADAPTIVE_WRITE_TIMEOUT_MAX,
+        )
+
     # Current temperature
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        return self._current_temp
+        return self._runtime.current_temp
 
     @callback
     def _async_update_temp(self, state: State) -> None:
@@ -371,9 +522,9 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
             current_temp = float(state.state)
             if not math.isfinite(current_temp):
                 raise ValueError(f"Sensor has illegal state {state.state}")
-            self._current_temp = current_temp
+            self._runtime.current_temp = current_temp
         except ValueError as e:
-            self._current_temp = None
+            self._runtime.current_temp = None
             _LOGGER.error("Unable to update from sensor: %s", e)
 
     # Presets
@@ -389,42 +540,68 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
             return
         if preset_mode == PRESET_NONE:
             self._attr_preset_mode = PRESET_NONE
-            self._target_temp = self._saved_target_temp
+            self._runtime.target_temp = self._runtime.saved_target_temp
+            self._select_valve_curve()
             await self._async_control_heating(force=True)
         else:
             if self._attr_preset_mode == PRESET_NONE:
-                self._saved_target_temp = self._target_temp
+                self._runtime.saved_target_temp = self._runtime.target_temp
             self._attr_preset_mode = preset_mode
-            self._target_temp = self._presets[preset_mode]
+            self._runtime.target_temp = self._config.preset_temperature(preset_mode)
+            self._select_valve_curve()
             await self._async_control_heating(force=True)
 
         self.async_write_ha_state()
 
+    def _select_valve_curve(self) -> None:
+        """Use the valve position mapping of the current preset."""
+        self._runtime.valve_curve = self._config.valve_curve_for(self._attr_preset_mode)
+        # The heat demand is relative to the closed and fully open positions
+        self._async_update_heat_demand(
+            self.hass.states.get(self._config.valve_entity_id)
+        )
+
+    @callback
+    def _async_scheduled_preset(self, preset_mode: str) -> None:
+        """Switch to the preset of a schedule transition."""
+        if preset_mode not in (self.preset_modes or []):
+            _LOGGER.warning(
+                "Schedule of %s uses unknown preset %s, skipping it",
+                self.entity_id,
+                preset_mode,
+            )
+            return
+        self.hass.async_create_task(
+            self.async_set_preset_mode(preset_mode), eager_start=True
+        )
+
     # Target temperature
     @property
     def target_temperature(self) -> float | None:
         """Return the temperature we try to reach."""
-        return self._target_temp
+        return self._runtime.target_temp
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         if (temperature := kwargs.get(ATTR_TEMPERATURE)) is None:
             return
-        self._attr_preset_mode = self._presets_inv.get(temperature, PRESET_NONE)
-        self._target_temp = temperature
+        self._attr_preset_mode = self._config.preset_for_temperature(temperature)
+        self._runtime.target_temp = temperature
+        self._select_valve_curve()
         await self._async_control_heating(force=True)
         self.async_write_ha_state()
 
     # Valve control
     async def _async_control_heating(self, force: bool = False) -> None:
         """Control the valve position."""
-        current_valve_state = self.hass.states.get(self._valve_entity_id)
+        current_valve_state = self.hass.states.get(self._config.valve_entity_id)
 
         if current_valve_state is None:
             _LOGGER.error(
                 "Failed to update the valve position because entity %s is not available",
-                self._valve_entity_id,
+                self._config.valve_entity_id,
             )
+            self._trace_decision(force, TraceResult.VALVE_UNAVAILABLE)
             return
 
         try:
@@ -434,18 +611,20 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
                 "Failed to update the valve position because parsing of the current state has failed: %s",
                 current_valve_state.state,
             )
+            self._trace_decision(force, TraceResult.VALVE_STATE_INVALID)
             return
 
         # Check if we are in the min cycle duration, skip updating valve if so.
-        if not force and self._min_cycle_duration:
+        min_cycle_duration = self._effective_min_cycle_duration
+        if not force and min_cycle_duration:
             try:
                 # TODO ignore unavailable/unkown states
                 # Check if the valve has been in its current state for the minimum duration
                 long_enough = condition.state(
                     hass=self.hass,
-                    entity=self._valve_entity_id,
+                    entity=self._config.valve_entity_id,
                     req_state=current_valve_state.state,  # Use the actual state string
-                    for_period=self._min_cycle_duration,
+                    for_period=min_cycle_duration,
                 )
 
             except ConditionError:
@@ -455,84 +634,66 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
                 _LOGGER.debug(
                     "Valve update blocked - minimum cycle duration not met, scheduling deferred update"
                 )
-                if self._pending_update_task and not self._pending_update_task.done():
+                pending_update_task = self._runtime.pending_update_task
+                if pending_update_task and not pending_update_task.done():
                     _LOGGER.debug(
                         "A deferred update is already scheduled, not scheduling another"
                     )
                 else:
                     self._schedule_deferred_update()
+                self._trace_decision(
+                    force, TraceResult.CYCLE_BLOCKED, current_valve_position
+                )
                 return
 
         # Check if temperature changed enough to allow valve position update
         if (
             not force
-            and self._min_temp_change_step > 0
-            and self._current_temp is not None
-            and self._last_valve_update_temp is not None
+            and self._config.min_temp_change_step > 0
+            and self._runtime.current_temp is not None
+            and self._runtime.last_valve_update_temp is not None
         ):
-            temp_difference = abs(self._current_temp - self._last_valve_update_temp)
+            temp_difference = abs(
+                self._runtime.current_temp - self._runtime.last_valve_update_temp
+            )
 
-            if temp_difference < self._min_temp_change_step:
+            if temp_difference < self._config.min_temp_change_step:
                 _LOGGER.debug(
                     "Temperature change (%.2f°C) is below threshold (%.2f°C), skipping valve update",
                     temp_difference,
-                    self._min_temp_change_step,
+                    self._config.min_temp_change_step,
+                )
+                self._trace_decision(
+                    force, TraceResult.TEMP_STEP_BLOCKED, current_valve_position
                 )
                 return
 
         # Cancel any pending deferred update since we're updating now
-        if self._pending_update_task and not self._pending_update_task.done():
-            self._pending_update_task.cancel()
+        pending_update_task = self._runtime.pending_update_task
+        if pending_update_task and not pending_update_task.done():
+            pending_update_task.cancel()
             _LOGGER.debug(
                 "Cancelled pending deferred update - executing immediate update"
             )
 
-        if self._hvac_mode == HVACMode.OFF:
+        if self._runtime.hvac_mode == HVACMode.OFF:
             # Close valve if the hvac mode is off.
             # To allow manual changes to the valve position while the thermostat is turned off
             #   (and not keep resetting it on temp changes), we only close it when force is True, which is the case when changing the hvac mode
             if force:
-                await self._set_valve_position(self._min_valve_position)
+                await self._async_write_valve_position(
+                    force, current_valve_position, self._runtime.valve_curve.minimum
+                )
+            else:
+                self._trace_decision(force, TraceResult.OFF, current_valve_position)
 
             # ...and do not perform further actions
             return
 
-        def calculate_valve_position(
-            current_temp: float | None, target_temp: float | None
-        ) -> float:
-            """Calculate the valve position based on the current and target temperature."""
-            if not current_temp or not target_temp:
-                _LOGGER.warning(
-                    "Current or target temperature is None, setting valve %s to emergency position",
-                    self._valve_entity_id,
-                )
-                return self._valve_emergency_position or self._min_valve_position
-
-            temp_difference = round(target_temp - current_temp, 1)
-
-            # Handle cases outside the defined range
-            if temp_difference <= self._sorted_valve_mapping_keys[0]:
-                # Return minimum value
-                return self._min_valve_position
-
-            if temp_difference >= self._sorted_valve_mapping_keys[-1]:
-                # Return maximum value
-                return self._valve_position_mapping[self._sorted_valve_mapping_keys[-1]]
-
-            # Find the appropriate valve position
-            for i, mapping_diff in enumerate(self._sorted_valve_mapping_keys):
-                if temp_difference <= mapping_diff:
-                    # Return the position from the previous threshold
-                    return self._valve_position_mapping[
-                        self._sorted_valve_mapping_keys[i - 1]
-                    ]
-
-            # Temp diff is higher than the highest threshold, fall back to max
-            return self._max_valve_position
-
         # Get new valve position
-        new_valve_position = calculate_valve_position(
-            current_temp=self._current_temp, target_temp=self._target_temp
+        new_valve_position = self._calculate_valve_position(
+            current_temp=self._runtime.current_temp,
+            target_temp=self._runtime.target_temp,
         )
         if new_valve_position == current_valve_position:
             # No need to update the valve position if it is already the same
@@ -540,30 +701,74 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
             #       (in case the thermostat did not report a state update and the actual value is different).
             #       Need to check if that would even work or if HA would ignore it if we set the same state again
             #       (maybe this check here isn't even neccessary in this case).
+            self._trace_decision(
+                force, TraceResult.UNCHANGED, current_valve_position, new_valve_position
+            )
             return
 
         # Set the new valve position and set the last update temp
-        await self._set_valve_position(new_valve_position)
-        self._last_valve_update_temp = self._current_temp
+        await self._async_write_valve_position(
+            force, current_valve_position, new_valve_position
+        )
+        self._runtime.last_valve_update_temp = self._runtime.current_temp
+
+    def _calculate_valve_position(
+        self, current_temp: float | None, target_temp: float | None
+    ) -> float:
+        """Calculate the valve position based on the current and target temperature."""
+        if not current_temp or not target_temp:
+            _LOGGER.warning(
+                "Current or target temperature is None, setting valve %s to emergency position",
+                self._config.valve_entity_id,
+            )
+            return (
+                self._config.valve_emergency_position
+                or self._runtime.valve_curve.minimum
+            )
+
+        return self._runtime.valve_curve.position(round(target_temp - current_temp, 1))
+
+    async def _async_write_valve_position(
+        self, force: bool, current_position: float, new_position: float
+    ) -> None:
+        """Set the valve position and record the outcome in the decision trace."""
+        if new_position != current_position:
+            # Only a changed position produces a state change to measure latency with
+            self._valve_latency.start(new_position)
+        try:
+            await self._set_valve_position(new_position)
+        except HomeAssistantError:
+            self._valve_latency.cancel()
+            self._trace_decision(
+                force, TraceResult.WRITE_FAILED, current_position, new_position
+            )
+            raise
+        self._trace_decision(force, TraceResult.WRITTEN, current_position, new_position)
 
     async def _set_valve_position(self, position: float) -> None:
         """Set the valve position using number.set_value service."""
         _LOGGER.debug("Setting valve position to %s", position)
 
-        domain = self._valve_entity_id.split(".", 1)[0]
+        domain = self._config.valve_entity_id.split(".", 1)[0]
 
-        await self.hass.services.async_call(
-            domain,
-            "set_value",
-            {"entity_id": self._valve_entity_id, "value": position},
-            blocking=True,
-        )
+        try:
+            async with asyncio.timeout(self._write_timeout):
+                await self.hass.services.async_call(
+                    domain,
+                    "set_value",
+                    {"entity_id": self._config.valve_entity_id, "value": position},
+                    blocking=True,
+                )
+        except TimeoutError as err:
+            raise HomeAssistantError(
+                f"Timed out setting the position of {self._config.valve_entity_id}"
+            ) from err
 
     def _schedule_deferred_update(self) -> None:
         """Schedule a deferred valve update after the minimum cycle duration."""
         # Calculate delay - get time since valve last changed
-        if self._min_cycle_duration:
-            valve_state = self.hass.states.get(self._valve_entity_id)
+        if min_cycle_duration := self._effective_min_cycle_duration:
+            valve_state = self.hass.states.get(self._config.valve_entity_id)
 
             if valve_state and valve_state.last_changed:
                 # Calculate time elapsed since valve last changed
@@ -571,7 +776,7 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
                     datetime.now(valve_state.last_changed.tzinfo)
                     - valve_state.last_changed
                 )
-                time_remaining = self._min_cycle_duration - time_elapsed
+                time_remaining = min_cycle_duration - time_elapsed
 
                 # If there's still time remaining, schedule for that time
                 if time_remaining.total_seconds() > 0:
@@ -581,9 +786,9 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
                     delay = 0.1
             else:
                 # Fallback to full cycle duration if we can't determine last change time
-                delay = self._min_cycle_duration.total_seconds()
+                delay = min_cycle_duration.total_seconds()
 
-            self._pending_update_task = self.hass.async_create_task(
+            self._runtime.pending_update_task = self.hass.async_create_task(
                 self._execute_deferred_update(delay)
             )
             _LOGGER.debug("Scheduled deferred valve update in %s seconds", delay)
@@ -597,10 +802,75 @@ class ValveControllerClimate(ClimateEntity, RestoreEntity):
         except asyncio.CancelledError:
             _LOGGER.debug("Deferred valve update was cancelled")
         finally:
-            self._pending_update_task = None
+            self._runtime.pending_update_task = None
+
+    # Decision trace
+    def _trace_decision(
+        self,
+        force: bool,
+        result: TraceResult,
+        valve_position: float | None = None,
+        new_valve_position: float | None = None,
+    ) -> None:
+        """Record a control decision in the trace buffer and publish it."""
+        runtime = self._runtime
+        runtime.last_result = result
+        if new_valve_position is not None:
+            runtime.computed_position = new_valve_position
+            if result is TraceResult.WRITTEN:
+                runtime.commanded_position = new_valve_position
+        self._telemetry.async_publish(self.entity_id)
+
+        self._trace.record(
+            time.time(),
+            force,
+            self._runtime.current_temp,
+            self._runtime.target_temp,
+            self._runtime.hvac_mode,
+            self._attr_preset_mode,
+            valve_position,
+            new_valve_position,
+            result,
+        )
+
+    @callback
+    def _telemetry_snapshot(self) -> dict[str, Any]:
+        """Return the values of all telemetry fields."""
+        runtime = self._runtime
+        sensor_state = self.hass.states.get(self._config.temp_sensor_entity_id)
+        valve_state = self.hass.states.get(self._config.valve_entity_id)
+        pending_update_task = runtime.pending_update_task
+        min_cycle_duration = self._effective_min_cycle_duration
+        return {
+            "raw_temperature": sensor_state.state if sensor_state else None,
+            "current_temperature": runtime.current_temp,
+            "target_temperature": runtime.target_temp,
+            "temperature_difference": round(
+                runtime.target_temp - runtime.current_temp, 1
+            )
+            if runtime.current_temp is not None and runtime.target_temp is not None
+            else None,
+            "hvac_mode": runtime.hvac_mode,
+            "preset_mode": self._attr_preset_mode,
+            "valve_position": valve_state.state if valve_state else None,
+            "computed_position": runtime.computed_position,
+            "commanded_position": runtime.commanded_position,
+            "result": runtime.last_result,
+            "deferred_update_pending": pending_update_task is not None
+            and not pending_update_task.done(),
+            "min_cycle_duration": min_cycle_duration.total_seconds()
+            if min_cycle_duration
+            else None,
+        }
+
+    async def async_dump_trace(self, count: int | None = None) -> dict[str, Any]:
+        """Return the most recent control decisions."""
+        return {"records": self._trace.export(count)}
 
     async def async_will_remove_from_hass(self) -> None:
         """Cancel any pending deferred updates when entity is removed."""
-        if self._pending_update_task and not self._pending_update_task.done():
-            self._pending_update_task.cancel()
+        pending_update_task = self._runtime.pending_update_task
+        if pending_update_task and not pending_update_task.done():
+            pending_update_task.cancel()
+        self._heat_demand.async_remove(self._attr_unique_id)
         await super().async_will_remove_from_hass()
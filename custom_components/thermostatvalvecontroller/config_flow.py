@@ -2,23 +2,31 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Coroutine, Mapping
 from typing import Any, cast
 
 import voluptuous as vol
 
+from homeassistant.components.input_boolean import DOMAIN as INPUT_BOOLEAN_DOMAIN
 from homeassistant.components.input_number import DOMAIN as INPUT_NUMBER_DOMAIN
 from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.helpers import selector
 from homeassistant.helpers.schema_config_entry_flow import (
+    SchemaCommonFlowHandler,
     SchemaConfigFlowHandler,
+    SchemaFlowError,
     SchemaFlowFormStep,
     SchemaFlowMenuStep,
 )
 
-from homeassistant.const import CONF_NAME, DEGREE
-from homeassistant.components.climate.const import DEFAULT_MIN_TEMP, DEFAULT_MAX_TEMP
+from homeassistant.const import CONF_NAME, DEGREE, PERCENTAGE
+from homeassistant.components.climate.const import (
+    DEFAULT_MIN_TEMP,
+    DEFAULT_MAX_TEMP,
+    PRESET_NONE,
+)
 
 from homeassistant.helpers.selector import (
     ObjectSelector,
@@ -29,6 +37,7 @@ from .const import (
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     CONF_POSITION_MAPPING,
+    CONF_PRESET_POSITION_MAPPINGS,
     CONF_PRECISION,
     CONF_PRESETS,
     CONF_TARGET_TEMP_STEP,
@@ -37,8 +46,17 @@ from .const import (
     CONF_VALVE_EMERGENCY_POSITION,
     CONF_MIN_CYCLE_DURATION,
     CONF_MIN_TEMP_CHANGE_STEP,
+    CONF_ADAPTIVE_TIMING,
+    CONF_BOILER_ENTITY_ID,
+    CONF_DEMAND_THRESHOLD,
+    CONF_HELPER_TYPE,
+    CONF_SCHEDULE,
     DOMAIN,
+    HELPER_TYPE_HEAT_DEMAND,
+    HELPER_TYPE_THERMOSTAT,
 )
+from .mapping import compile_mapping
+from .schedule import compile_schedule
 
 VALVE_SCHEMA = vol.Schema(
     {
@@ -72,6 +90,7 @@ VALVE_SCHEMA = vol.Schema(
                 unit_of_measurement=DEGREE,
             )
         ),
+        vol.Optional(CONF_ADAPTIVE_TIMING, default=False): selector.BooleanSelector(),
     }
 )
 
@@ -93,6 +112,9 @@ VALVE_POSITION_SCHEMA = vol.Schema(
                 "2.0": 180,
             },
         ): ObjectSelector(ObjectSelectorConfig()),
+        vol.Optional(CONF_PRESET_POSITION_MAPPINGS): ObjectSelector(
+            ObjectSelectorConfig()
+        ),
     }
 )
 
@@ -135,27 +157,150 @@ PRESETS_SCHEMA = vol.Schema(
     }
 )
 
+SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_SCHEDULE): ObjectSelector(ObjectSelectorConfig()),
+    }
+)
+
+HEAT_DEMAND_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_BOILER_ENTITY_ID): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=[SWITCH_DOMAIN, INPUT_BOOLEAN_DOMAIN])
+        ),
+        vol.Optional(CONF_DEMAND_THRESHOLD, default=0): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=100,
+                step=0.1,
+                unit_of_measurement=PERCENTAGE,
+            )
+        ),
+        vol.Optional(CONF_MIN_CYCLE_DURATION): selector.DurationSelector(
+            selector.DurationSelectorConfig(allow_negative=False)
+        ),
+    }
+)
+
 CONFIG_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME): selector.TextSelector(),
     }
 ).extend(VALVE_SCHEMA.schema)
 
+HEAT_DEMAND_CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): selector.TextSelector(),
+    }
+).extend(HEAT_DEMAND_SCHEMA.schema)
+
+# Options step to start with for each helper type
+OPTIONS_STEPS = {
+    HELPER_TYPE_THERMOSTAT: "menu",
+    HELPER_TYPE_HEAT_DEMAND: "heat_demand",
+}
+
+
+async def choose_options_step(options: dict[str, Any]) -> str:
+    """Return next step_id for options flow according to helper_type."""
+    # Entries created before heat demand helpers existed have no helper type
+    return OPTIONS_STEPS[options.get(CONF_HELPER_TYPE, HELPER_TYPE_THERMOSTAT)]
+
+
+def set_helper_type(
+    helper_type: str,
+) -> Callable[
+    [SchemaCommonFlowHandler, dict[str, Any]], Coroutine[Any, Any, dict[str, Any]]
+]:
+    """Set helper type."""
+
+    async def _set_helper_type(
+        handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Add helper type to user input."""
+        return {CONF_HELPER_TYPE: helper_type, **user_input}
+
+    return _set_helper_type
+
+
+async def validate_position_mappings(
+    handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate the default and the per preset valve position mappings."""
+    try:
+        compile_mapping(user_input.get(CONF_POSITION_MAPPING, {}))
+    except ValueError as err:
+        raise SchemaFlowError("invalid_position_mapping") from err
+
+    preset_mappings = user_input.get(CONF_PRESET_POSITION_MAPPINGS, {})
+    if not isinstance(preset_mappings, Mapping):
+        raise SchemaFlowError("invalid_preset_position_mappings")
+    for preset, mapping in preset_mappings.items():
+        if preset not in CONF_PRESETS:
+            raise SchemaFlowError("invalid_preset_position_mappings")
+        try:
+            compile_mapping(mapping)
+        except ValueError as err:
+            raise SchemaFlowError("invalid_preset_position_mappings") from err
+
+    return user_input
+
+
+async def validate_schedule(
+    handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate the schedule and check that it only uses configured presets."""
+    if CONF_SCHEDULE not in user_input:
+        return user_input
+
+    try:
+        schedule = compile_schedule(user_input[CONF_SCHEDULE])
+    except ValueError as err:
+        raise SchemaFlowError("invalid_schedule") from err
+
+    presets = {preset for preset, key in CONF_PRESETS.items() if key in handler.options}
+    if not set(schedule.presets) <= presets | {PRESET_NONE}:
+        raise SchemaFlowError("unknown_schedule_preset")
+
+    return user_input
+
+
 CONFIG_FLOW: dict[str, SchemaFlowFormStep | SchemaFlowMenuStep] = {
-    "user": SchemaFlowFormStep(CONFIG_SCHEMA, next_step="valve_position"),
-    "valve_position": SchemaFlowFormStep(VALVE_POSITION_SCHEMA, next_step="thermostat"),
+    "user": SchemaFlowMenuStep(options=["valve", "heat_demand"]),
+    "valve": SchemaFlowFormStep(
+        CONFIG_SCHEMA,
+        validate_user_input=set_helper_type(HELPER_TYPE_THERMOSTAT),
+        next_step="valve_position",
+    ),
+    "valve_position": SchemaFlowFormStep(
+        VALVE_POSITION_SCHEMA,
+        validate_user_input=validate_position_mappings,
+        next_step="thermostat",
+    ),
     "thermostat": SchemaFlowFormStep(THERMOSTAT_SCHEMA, next_step="presets"),
     "presets": SchemaFlowFormStep(PRESETS_SCHEMA),
+    "heat_demand": SchemaFlowFormStep(
+        HEAT_DEMAND_CONFIG_SCHEMA,
+        validate_user_input=set_helper_type(HELPER_TYPE_HEAT_DEMAND),
+    ),
 }
 
 OPTIONS_FLOW: dict[str, SchemaFlowFormStep | SchemaFlowMenuStep] = {
-    "init": SchemaFlowMenuStep(
-        options=["valve", "valve_position", "thermostat", "presets"]
+    "init": SchemaFlowFormStep(next_step=choose_options_step),
+    "menu": SchemaFlowMenuStep(
+        options=["valve", "valve_position", "thermostat", "presets", "schedule"]
     ),
     "valve": SchemaFlowFormStep(VALVE_SCHEMA),
-    "valve_position": SchemaFlowFormStep(VALVE_POSITION_SCHEMA),
+    "valve_position": SchemaFlowFormStep(
+        VALVE_POSITION_SCHEMA, validate_user_input=validate_position_mappings
+    ),
     "thermostat": SchemaFlowFormStep(THERMOSTAT_SCHEMA),
     "presets": SchemaFlowFormStep(PRESETS_SCHEMA),
+    "schedule": SchemaFlowFormStep(
+        SCHEDULE_SCHEMA, validate_user_input=validate_schedule
+    ),
+    "heat_demand": SchemaFlowFormStep(HEAT_DEMAND_SCHEMA),
 }
 
 
@@ -11,6 +11,11 @@ from homeassistant.components.climate.const import (
 
 DOMAIN = "thermostatvalvecontroller"
 
+# Helper types
+CONF_HELPER_TYPE = "helper_type"
+HELPER_TYPE_THERMOSTAT = "thermostat"
+HELPER_TYPE_HEAT_DEMAND = "heat_demand"
+
 # Valve
 CONF_TEMPERATURE_SENSOR_ENTITY_ID = "temperature_sensor_entity_id"
 CONF_PRECISION = "precision"
@@ -18,9 +23,18 @@ CONF_VALVE_ENTITY_ID = "valve_entity_id"
 CONF_MIN_CYCLE_DURATION = "min_cycle_duration"
 CONF_VALVE_EMERGENCY_POSITION = "valve_emergency_position"
 CONF_MIN_TEMP_CHANGE_STEP = "min_temp_change_step"
+CONF_ADAPTIVE_TIMING = "adaptive_timing"
 
 # Valve Positions
 CONF_POSITION_MAPPING = "position_mapping"
+CONF_PRESET_POSITION_MAPPINGS = "preset_position_mappings"
+
+# Schedule
+CONF_SCHEDULE = "schedule"
+
+# Heat demand
+CONF_BOILER_ENTITY_ID = "boiler_entity_id"
+CONF_DEMAND_THRESHOLD = "demand_threshold"
 
 # Thermostat
 CONF_MIN_TEMP = "min_temp"
@@ -39,3 +53,33 @@ CONF_PRESETS = {
         PRESET_ACTIVITY,
     )
 }
+
+# Decision trace
+TRACE_BUFFER_SIZE = 200
+SERVICE_DUMP_TRACE = "dump_trace"
+ATTR_COUNT = "count"
+
+# Valve latency
+ATTR_VALVE_LATENCY_P50 = "valve_latency_p50"
+ATTR_VALVE_LATENCY_P95 = "valve_latency_p95"
+ATTR_VALVE_LATENCY_SAMPLES = "valve_latency_samples"
+# Number of round trips needed before adaptive timing kicks in
+ADAPTIVE_MIN_SAMPLES = 5
+# With adaptive timing, the cycle duration is at least this multiple of the p95 latency
+ADAPTIVE_CYCLE_LATENCY_FACTOR = 4
+# With adaptive timing, writes time out after this multiple of the p95 latency...
+ADAPTIVE_WRITE_TIMEOUT_LATENCY_FACTOR = 3
+# ...clamped to these bounds (in seconds). Round trips longer than the maximum
+# are not counted as a valve response.
+ADAPTIVE_WRITE_TIMEOUT_MIN = 10
+ADAPTIVE_WRITE_TIMEOUT_MAX = 120
+
+# Telemetry
+WS_TYPE_SUBSCRIBE = f"{DOMAIN}/subscribe"
+ATTR_ENTITY_IDS = "entity_ids"
+ATTR_FIELDS = "fields"
+ATTR_MIN_INTERVAL = "min_interval"
+# Seconds between two telemetry messages to the same subscriber, subscribers
+# may ask for a longer interval but not for a shorter one than the minimum
+TELEMETRY_DEFAULT_INTERVAL = 1.0
+TELEMETRY_MIN_INTERVAL = 0.1
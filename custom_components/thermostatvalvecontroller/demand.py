@@ -0,0 +1,275 @@
+"""House-wide heat demand for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_HEAT_DEMAND: HassKey[HeatDemandAggregator] = HassKey(
+    "thermostatvalvecontroller_heat_demand"
+)
+
+
+class HeatDemandAggregator:
+    """Combine the valve positions of all controllers.
+
+    Every controller reports its own position changes, the totals are adjusted
+    by the difference instead of being recomputed over all rooms.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregator."""
+        # key -> (position, opening fraction, is open)
+        self._controllers: dict[str, tuple[float, float, bool]] = {}
+        # position -> number of controllers at that position, used to track the maximum
+        self._position_counts: dict[float, int] = {}
+        self._total = 0.0
+        self._fraction_total = 0.0
+        self._open_count = 0
+        self._maximum: float | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def controller_count(self) -> int:
+        """Return the number of controllers with a known valve position."""
+        return len(self._controllers)
+
+    @property
+    def total(self) -> float:
+        """Return the sum of all valve positions."""
+        return self._total
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest valve position."""
+        return self._maximum
+
+    @property
+    def open_count(self) -> int:
+        """Return the number of valves that are open."""
+        return self._open_count
+
+    @property
+    def weighted_demand(self) -> float | None:
+        """Return the average valve opening of all controllers in percent."""
+        if not self._controllers:
+            return None
+        return self._fraction_total / len(self._controllers) * 100
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for demand changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update(
+        self, key: str, position: float, min_position: float, max_position: float
+    ) -> None:
+        """Update the valve position of a controller."""
+        fraction = (
+            min(max((position - min_position) / (max_position - min_position), 0), 1)
+            if max_position > min_position
+            else 0.0
+        )
+        is_open = position > min_position
+        new = (position, fraction, is_open)
+
+        if (old := self._controllers.get(key)) is not None:
+            if old == new:
+                return
+            self._remove(old)
+        self._controllers[key] = new
+
+        self._total += position
+        self._fraction_total += fraction
+        self._open_count += is_open
+        self._position_counts[position] = self._position_counts.get(position, 0) + 1
+        if self._maximum is None or position > self._maximum:
+            self._maximum = position
+
+        self._async_notify()
+
+    @callback
+    def async_remove(self, key: str) -> None:
+        """Remove a controller, e.g. when its valve becomes unavailable."""
+        if (old := self._controllers.pop(key, None)) is None:
+            return
+        self._remove(old)
+        if not self._controllers:
+            # Drop accumulated floating point error
+            self._total = self._fraction_total = 0.0
+        self._async_notify()
+
+    def _remove(self, old: tuple[float, float, bool]) -> None:
+        """Subtract a previously reported position from the totals."""
+        position, fraction, is_open = old
+        self._total -= position
+        self._fraction_total -= fraction
+        self._open_count -= is_open
+
+        remaining = self._position_counts[position] - 1
+        if remaining:
+            self._position_counts[position] = remaining
+            return
+        del self._position_counts[position]
+        if position == self._maximum:
+            # Only the distinct positions have to be searched, there are only a few
+            self._maximum = max(self._position_counts, default=None)
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in self._listeners:
+            update_callback()
+
+
+@singleton(DATA_HEAT_DEMAND)
+@callback
+def async_get_heat_demand(hass: HomeAssistant) -> HeatDemandAggregator:
+    """Return the heat demand aggregator."""
+    return HeatDemandAggregator()
+
+
+class BoilerSwitch:
+    """Switch a boiler entity based on the heat demand."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        aggregator: HeatDemandAggregator,
+        entity_id: str,
+        demand_threshold: float,
+        min_cycle_duration: timedelta | None,
+    ) -> None:
+        """Initialize the boiler switch."""
+        self.hass = hass
+        self._aggregator = aggregator
+        self._entity_id = entity_id
+        self._domain = entity_id.split(".", 1)[0]
+        self._demand_threshold = demand_threshold
+        self._min_cycle_duration = min_cycle_duration
+        self._cancel_deferred: CALLBACK_TYPE | None = None
+        # The thermostats only report their valves once Home Assistant has started
+        self._started = False
+        # State of the last turn_on/turn_off call, until the boiler reports it
+        self._commanded_on: bool | None = None
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start following the heat demand, return a function to stop."""
+        remove_listener = self._aggregator.async_add_listener(self._async_update)
+        # Also re-check when the boiler shows up or is switched by someone else
+        remove_tracker = async_track_state_change_event(
+            self.hass, [self._entity_id], self._async_boiler_changed
+        )
+        remove_started = async_at_started(self.hass, self._async_hass_started)
+
+        @callback
+        def stop() -> None:
+            remove_listener()
+            remove_tracker()
+            remove_started()
+            if self._cancel_deferred is not None:
+                self._cancel_deferred()
+                self._cancel_deferred = None
+
+        return stop
+
+    @callback
+    def _async_hass_started(self, _: HomeAssistant) -> None:
+        """Start switching the boiler once all thermostats have reported."""
+        self._started = True
+        self._async_update()
+
+    @callback
+    def _async_boiler_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Handle boiler state changes."""
+        self._async_update()
+
+    @callback
+    def _async_update(self) -> None:
+        """Turn the boiler on or off if the demand requires it."""
+        if not self._started:
+            return
+        state = self.hass.states.get(self._entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+
+        # Without any known valve position, leave the boiler as it is
+        if (weighted_demand := self._aggregator.weighted_demand) is None:
+            return
+        turn_on = weighted_demand > self._demand_threshold
+        if turn_on == (state.state == STATE_ON):
+            self._commanded_on = None
+            return
+        if turn_on == self._commanded_on:
+            # The same call is still on its way
+            return
+
+        if self._cancel_deferred is not None:
+            # A deferred update is already scheduled
+            return
+
+        if self._min_cycle_duration:
+            remaining = self._min_cycle_duration - (
+                dt_util.utcnow() - state.last_changed
+            )
+            if remaining.total_seconds() > 0:
+                _LOGGER.debug(
+                    "Boiler switch blocked - minimum cycle duration not met, retrying in %s",
+                    remaining,
+                )
+                self._cancel_deferred = async_call_later(
+                    self.hass, remaining, self._async_deferred_update
+                )
+                return
+
+        self._commanded_on = turn_on
+        self.hass.async_create_task(self._async_switch(turn_on), eager_start=True)
+
+    async def _async_switch(self, turn_on: bool) -> None:
+        """Turn the boiler on or off."""
+        try:
+            await self.hass.services.async_call(
+                self._domain,
+                "turn_on" if turn_on else "turn_off",
+                {"entity_id": self._entity_id},
+                blocking=True,
+            )
+        except HomeAssistantError as err:
+            _LOGGER.error("Failed to switch the boiler %s: %s", self._entity_id, err)
+            # Allow the next demand change to try again
+            if self._commanded_on == turn_on:
+                self._commanded_on = None
+
+    @callback
+    def _async_deferred_update(self, _: datetime) -> None:
+        """Re-check the demand after the minimum cycle duration has passed."""
+        self._cancel_deferred = None
+        self._async_update()
@@ -0,0 +1,125 @@
+"""Valve round-trip latency tracking for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+import time
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P² algorithm.
+
+    Only five markers are kept, so memory use does not grow with the number of
+    samples (Jain & Chlamtac, 1985).
+    """
+
+    __slots__ = ("_count", "_desired", "_heights", "_increments", "_p", "_positions")
+
+    def __init__(self, p: float) -> None:
+        """Initialize the estimator for quantile `p` (0 < p < 1)."""
+        self._p = p
+        self._count = 0
+        self._heights: list[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples seen."""
+        return self._count
+
+    @property
+    def value(self) -> float | None:
+        """Return the current estimate, or None if no samples were added."""
+        if self._count == 0:
+            return None
+        if self._count <= 5:
+            heights = sorted(self._heights)
+            return heights[min(int(self._p * self._count), self._count - 1)]
+        return self._heights[2]
+
+    def add(self, sample: float) -> None:
+        """Add a sample to the estimate."""
+        self._count += 1
+        q = self._heights
+
+        if self._count <= 5:
+            q.append(sample)
+            if self._count == 5:
+                q.sort()
+            return
+
+        n = self._positions
+
+        # Find the cell the sample falls into and update the extreme markers
+        if sample < q[0]:
+            q[0] = sample
+            k = 0
+        elif sample >= q[4]:
+            q[4] = sample
+            k = 3
+        else:
+            k = 0
+            while sample >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Adjust the middle markers if they drifted from their desired positions
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    # Parabolic prediction is out of bounds, fall back to linear
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+
+class ValveLatencyTracker:
+    """Measure the time between writing a valve position and the valve reporting it."""
+
+    __slots__ = ("_max_sample", "_pending_position", "_pending_since", "p50", "p95")
+
+    def __init__(self, max_sample: float) -> None:
+        """Initialize the tracker, ignoring samples longer than `max_sample` seconds."""
+        self._max_sample = max_sample
+        self._pending_position: float | None = None
+        self._pending_since: float | None = None
+        self.p50 = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+
+    @property
+    def count(self) -> int:
+        """Return the number of measured round trips."""
+        return self.p50.count
+
+    def start(self, position: float) -> None:
+        """Mark that `position` was just written to the valve."""
+        self._pending_position = position
+        self._pending_since = time.monotonic()
+
+    def cancel(self) -> None:
+        """Forget the pending write, e.g. because it failed."""
+        self._pending_since = None
+
+    def complete(self, position: float) -> None:
+        """Record the round trip if the valve reported the pending position."""
+        if self._pending_since is None or position != self._pending_position:
+            # Not the answer to our write, e.g. a manual change
+            return
+        sample = time.monotonic() - self._pending_since
+        self._pending_since = None
+        if sample > self._max_sample:
+            # Came in after the write would have timed out, not a round trip
+            return
+        self.p50.add(sample)
+        self.p95.add(sample)
@@ -0,0 +1,66 @@
+"""Valve position mappings for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from math import isfinite
+from weakref import WeakValueDictionary
+
+
+class ValveCurve:
+    """Compiled valve position mapping.
+
+    Maps the difference between target and current temperature to a valve
+    position, using a binary search over the sorted thresholds. Thresholds and
+    positions are stored as packed double arrays.
+    """
+
+    __slots__ = ("__weakref__", "maximum", "minimum", "positions", "thresholds")
+
+    def __init__(self, mapping: Mapping[float, float]) -> None:
+        """Initialize the curve from a non-empty mapping of threshold to position."""
+        self.thresholds = array("d", sorted(mapping))
+        self.positions = array("d", (mapping[key] for key in self.thresholds))
+        self.minimum = min(self.positions)
+        self.maximum = max(self.positions)
+
+    def position(self, temp_difference: float) -> float:
+        """Return the valve position for a temperature difference."""
+        thresholds = self.thresholds
+
+        # Handle cases outside the defined range
+        if temp_difference <= thresholds[0]:
+            return self.minimum
+        if temp_difference >= thresholds[-1]:
+            return self.positions[-1]
+
+        # Use the position of the highest threshold below the difference
+        return self.positions[bisect_left(thresholds, temp_difference) - 1]
+
+
+# Curves are immutable, controllers with the same mapping share one instance
+_CURVES: WeakValueDictionary[tuple[tuple[float, float], ...], ValveCurve] = (
+    WeakValueDictionary()
+)
+
+
+def compile_mapping(mapping: Mapping[str, float]) -> ValveCurve:
+    """Compile a mapping as stored in the config entry.
+
+    Returns the existing curve if an identical mapping was compiled before.
+
+    Raises ValueError if the mapping is empty, not numeric or not finite.
+    """
+    if not isinstance(mapping, Mapping) or not mapping:
+        raise ValueError("Valve position mapping must be a non-empty mapping")
+    try:
+        points = tuple(sorted((float(k), float(v)) for k, v in mapping.items()))
+    except TypeError as err:
+        raise ValueError("Valve position mapping must only contain numbers") from err
+    if not all(isfinite(key) and isfinite(value) for key, value in points):
+        raise ValueError("Valve position mapping must only contain finite numbers")
+    if (curve := _CURVES.get(points)) is None:
+        curve = _CURVES[points] = ValveCurve(dict(points))
+    return curve
@@ -0,0 +1,77 @@
+"""Controller configuration and runtime state for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+import asyncio
+from array import array
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.components.climate.const import PRESET_NONE
+
+from .mapping import ValveCurve
+from .schedule import CompiledSchedule
+from .trace import TraceResult
+
+
+@dataclass(frozen=True, slots=True)
+class ControllerConfig:
+    """Immutable configuration of a controller, built once from the config entry.
+
+    Presets are kept as parallel sequences instead of dicts: `preset_temps` and
+    `preset_valve_curves` hold the temperature and the optional valve curve of
+    the preset with the same index in `preset_names`. Valve curves are shared
+    between controllers with identical mappings.
+    """
+
+    valve_entity_id: str
+    temp_sensor_entity_id: str
+    valve_curve: ValveCurve
+    preset_names: tuple[str, ...]
+    preset_temps: array[float]
+    preset_valve_curves: tuple[ValveCurve | None, ...]
+    min_cycle_duration: timedelta | None
+    valve_emergency_position: float | None
+    min_temp_change_step: float
+    adaptive_timing: bool
+    schedule: CompiledSchedule | None
+
+    def preset_temperature(self, preset: str | None) -> float | None:
+        """Return the target temperature of a preset, or None if it is unknown."""
+        try:
+            return self.preset_temps[self.preset_names.index(preset)]
+        except ValueError:
+            return None
+
+    def preset_for_temperature(self, temperature: float) -> str:
+        """Return the last preset with the given temperature, or PRESET_NONE."""
+        for index in range(len(self.preset_temps) - 1, -1, -1):
+            if self.preset_temps[index] == temperature:
+                return self.preset_names[index]
+        return PRESET_NONE
+
+    def valve_curve_for(self, preset: str | None) -> ValveCurve:
+        """Return the valve curve of a preset, falling back to the default curve."""
+        try:
+            curve = self.preset_valve_curves[self.preset_names.index(preset)]
+        except ValueError:
+            return self.valve_curve
+        return curve or self.valve_curve
+
+
+@dataclass(slots=True)
+class ControllerState:
+    """Mutable runtime state of a controller."""
+
+    valve_curve: ValveCurve
+    target_temp: float | None = None
+    saved_target_temp: float | None = None
+    current_temp: float | None = None
+    hvac_mode: HVACMode | None = None
+    last_valve_update_temp: float | None = None
+    pending_update_task: asyncio.Task | None = None
+    # Outcome of the last control pass
+    last_result: TraceResult | None = None
+    computed_position: float | None = None
+    commanded_position: float | None = None
@@ -0,0 +1,222 @@
+"""Weekly preset schedules for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from collections.abc import Callable, Mapping
+from datetime import datetime, time, timedelta
+from itertools import count
+from typing import NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+DATA_SCHEDULE_ENGINE: HassKey[ScheduleEngine] = HassKey(
+    "thermostatvalvecontroller_schedule_engine"
+)
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+SCHEDULE_DAILY = "daily"
+
+_SECONDS_PER_DAY = 86400
+
+
+class CompiledSchedule(NamedTuple):
+    """Transition table of a weekly schedule.
+
+    `offsets` are the seconds since Monday 00:00 (local time) in ascending order,
+    `presets` holds the preset to switch to at the offset with the same index.
+    """
+
+    offsets: tuple[int, ...]
+    presets: tuple[str, ...]
+
+
+def compile_schedule(schedule: Mapping[str, Mapping[str, str]]) -> CompiledSchedule:
+    """Compile a schedule of `{day: {"HH:MM": preset}}` into a transition table.
+
+    `day` is one of `WEEKDAYS` or `SCHEDULE_DAILY`. Entries for a specific day
+    take precedence over daily entries at the same time.
+
+    Raises ValueError if the schedule is invalid.
+    """
+    transitions: dict[int, str] = {}
+
+    try:
+        # Handle daily entries first so specific days can override them
+        days = sorted(schedule.items(), key=lambda item: item[0] != SCHEDULE_DAILY)
+    except AttributeError as err:
+        raise ValueError("Schedule must be a mapping of day to entries") from err
+
+    for day, entries in days:
+        if day == SCHEDULE_DAILY:
+            day_indexes: range | tuple[int] = range(len(WEEKDAYS))
+        elif day in WEEKDAYS:
+            day_indexes = (WEEKDAYS.index(day),)
+        else:
+            raise ValueError(f"Invalid day {day}")
+
+        try:
+            items = entries.items()
+        except AttributeError as err:
+            raise ValueError(
+                f"Entries of {day} must be a mapping of time to preset"
+            ) from err
+
+        for time_str, preset in items:
+            if (parsed := dt_util.parse_time(str(time_str))) is None:
+                raise ValueError(f"Invalid time {time_str}")
+            seconds = parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+            for index in day_indexes:
+                transitions[index * _SECONDS_PER_DAY + seconds] = str(preset)
+
+    offsets = tuple(sorted(transitions))
+    return CompiledSchedule(offsets, tuple(transitions[o] for o in offsets))
+
+
+def _week_offset(local: datetime) -> int:
+    """Return the seconds since Monday 00:00 of a local time."""
+    return (
+        local.weekday() * _SECONDS_PER_DAY
+        + local.hour * 3600
+        + local.minute * 60
+        + local.second
+    )
+
+
+def active_preset(schedule: CompiledSchedule, at: datetime) -> str:
+    """Return the preset of the last transition at or before `at`."""
+    index = bisect_right(schedule.offsets, _week_offset(dt_util.as_local(at)))
+    # Before the first transition of the week, the last one of the previous week applies
+    return schedule.presets[index - 1]
+
+
+def next_transition(
+    schedule: CompiledSchedule, after: datetime
+) -> tuple[datetime, str]:
+    """Return the time (UTC) and preset of the first transition after `after`."""
+    local = dt_util.as_local(after)
+    offset = _week_offset(local)
+    week_start = local.date() - timedelta(days=local.weekday())
+    index = bisect_right(schedule.offsets, offset)
+
+    while True:
+        if index == len(schedule.offsets):
+            index = 0
+            week_start += timedelta(days=7)
+
+        day, seconds = divmod(schedule.offsets[index], _SECONDS_PER_DAY)
+        when = dt_util.as_utc(
+            datetime.combine(
+                week_start + timedelta(days=day),
+                time(seconds // 3600, seconds // 60 % 60, seconds % 60),
+                tzinfo=dt_util.get_default_time_zone(),
+            )
+        )
+        # Skip transitions that fall into a daylight saving time gap and
+        # therefore end up at or before the reference time
+        if when > after:
+            return when, schedule.presets[index]
+        index += 1
+
+
+class _ScheduledController:
+    """A controller that follows a schedule."""
+
+    __slots__ = ("action", "removed", "schedule")
+
+    def __init__(
+        self, schedule: CompiledSchedule, action: Callable[[str], None]
+    ) -> None:
+        self.schedule = schedule
+        self.action = action
+        self.removed = False
+
+
+class ScheduleEngine:
+    """Run the schedules of all controllers from a single timer.
+
+    The next transition of every controller is kept in a heap, only the
+    earliest one has a timer armed. When it fires, every controller with a
+    due transition switches to its current preset and the timer is re-armed
+    for the new earliest transition.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the schedule engine."""
+        self.hass = hass
+        self._heap: list[tuple[datetime, int, _ScheduledController, str]] = []
+        self._sequence = count()
+        self._armed_at: datetime | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add(
+        self, schedule: CompiledSchedule, action: Callable[[str], None]
+    ) -> CALLBACK_TYPE:
+        """Call `action` with the preset of each transition, return a function to stop."""
+        controller = _ScheduledController(schedule, action)
+        self._push(controller, dt_util.utcnow())
+        self._async_arm()
+
+        @callback
+        def remove() -> None:
+            # The heap entry is dropped once it reaches the top
+            controller.removed = True
+            self._async_arm()
+
+        return remove
+
+    def _push(self, controller: _ScheduledController, after: datetime) -> None:
+        """Queue the next transition of a controller."""
+        when, preset = next_transition(controller.schedule, after)
+        heapq.heappush(self._heap, (when, next(self._sequence), controller, preset))
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest pending transition."""
+        while self._heap and self._heap[0][2].removed:
+            heapq.heappop(self._heap)
+
+        next_time = self._heap[0][0] if self._heap else None
+        if next_time == self._armed_at:
+            return
+
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self._armed_at = next_time
+        if next_time is not None:
+            self._cancel_timer = async_track_point_in_utc_time(
+                self.hass, self._async_fire, next_time
+            )
+
+    @callback
+    def _async_fire(self, scheduled: datetime) -> None:
+        """Apply all due transitions and re-arm the timer."""
+        self._cancel_timer = None
+        self._armed_at = None
+        # The timer passes the time it was armed for, which is stale if it fired late
+        now = max(scheduled, dt_util.utcnow())
+
+        while self._heap and self._heap[0][0] <= now:
+            _, _, controller, _ = heapq.heappop(self._heap)
+            if controller.removed:
+                continue
+            # A late timer (suspend, clock jump) may have skipped transitions,
+            # only the one in effect now is applied
+            controller.action(active_preset(controller.schedule, now))
+            self._push(controller, now)
+
+        self._async_arm()
+
+
+@singleton(DATA_SCHEDULE_ENGINE)
+@callback
+def async_get_schedule_engine(hass: HomeAssistant) -> ScheduleEngine:
+    """Return the schedule engine."""
+    return ScheduleEngine(hass)
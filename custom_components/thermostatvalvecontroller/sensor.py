@@ -0,0 +1,114 @@
+"""Sensor platform for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+from .const import DOMAIN
+from .demand import HeatDemandAggregator, async_get_heat_demand
+
+
+@dataclass(frozen=True, kw_only=True)
+class HeatDemandSensorEntityDescription(SensorEntityDescription):
+    """Describes a heat demand sensor."""
+
+    value_fn: Callable[[HeatDemandAggregator], float | int | None]
+
+
+SENSOR_TYPES: tuple[HeatDemandSensorEntityDescription, ...] = (
+    HeatDemandSensorEntityDescription(
+        key="weighted_demand",
+        translation_key="weighted_demand",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda aggregator: aggregator.weighted_demand,
+    ),
+    HeatDemandSensorEntityDescription(
+        key="open_valves",
+        translation_key="open_valves",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregator: aggregator.open_count,
+    ),
+    HeatDemandSensorEntityDescription(
+        key="total_valve_position",
+        translation_key="total_valve_position",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregator: aggregator.total,
+    ),
+    HeatDemandSensorEntityDescription(
+        key="max_valve_position",
+        translation_key="max_valve_position",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregator: aggregator.maximum,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Initialize heat demand config entry."""
+    aggregator = async_get_heat_demand(hass)
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        name=config_entry.title,
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+    async_add_entities(
+        HeatDemandSensor(
+            aggregator=aggregator,
+            description=description,
+            unique_id=f"{config_entry.entry_id}_{description.key}",
+            device_info=device_info,
+        )
+        for description in SENSOR_TYPES
+    )
+
+
+class HeatDemandSensor(SensorEntity):
+    """Representation of a house-wide heat demand sensor."""
+
+    entity_description: HeatDemandSensorEntityDescription
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        aggregator: HeatDemandAggregator,
+        description: HeatDemandSensorEntityDescription,
+        unique_id: str,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._aggregator = aggregator
+        self._attr_unique_id = unique_id
+        self._attr_device_info = device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Run when entity about to be added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._aggregator.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the current heat demand."""
+        return self.entity_description.value_fn(self._aggregator)
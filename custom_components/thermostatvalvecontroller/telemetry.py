@@ -0,0 +1,208 @@
+"""Live controller telemetry for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Collection
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+DATA_TELEMETRY: HassKey[TelemetryHub] = HassKey("thermostatvalvecontroller_telemetry")
+
+# Field names of a controller snapshot.
+TELEMETRY_FIELDS = (
+    "raw_temperature",
+    "current_temperature",
+    "target_temperature",
+    "temperature_difference",
+    "hvac_mode",
+    "preset_mode",
+    "valve_position",
+    "computed_position",
+    "commanded_position",
+    "result",
+    "deferred_update_pending",
+    "min_cycle_duration",
+)
+
+SnapshotCallback = Callable[[], dict[str, Any]]
+
+
+class TelemetrySubscription:
+    """A single subscriber, receiving throttled deltas of the selected fields.
+
+    Snapshots published in between two messages are coalesced, only the latest
+    one per controller is kept. A message contains the fields that changed
+    since the previous message, or None for a controller that was removed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[dict[str, Any]], None],
+        entity_ids: Collection[str] | None,
+        fields: Collection[str] | None,
+        min_interval: float,
+    ) -> None:
+        """Initialize the subscription."""
+        self.hass = hass
+        self._send = send
+        self._entity_ids = frozenset(entity_ids) if entity_ids else None
+        self._fields = tuple(fields) if fields else None
+        self._min_interval = min_interval
+        self._pending: dict[str, dict[str, Any] | None] = {}
+        self._sent: dict[str, dict[str, Any]] = {}
+        self._last_flush: float | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = None
+
+    def wants(self, entity_id: str) -> bool:
+        """Return if the subscriber is interested in a controller."""
+        return self._entity_ids is None or entity_id in self._entity_ids
+
+    @callback
+    def async_publish(self, entity_id: str, snapshot: dict[str, Any]) -> None:
+        """Queue the latest snapshot of a controller."""
+        self._queue(entity_id, snapshot)
+        self._async_schedule()
+
+    @callback
+    def async_publish_all(self, snapshots: dict[str, dict[str, Any]]) -> None:
+        """Queue the snapshots of several controllers, to be sent in one message."""
+        for entity_id, snapshot in snapshots.items():
+            self._queue(entity_id, snapshot)
+        self._async_schedule()
+
+    @callback
+    def async_publish_removed(self, entity_id: str) -> None:
+        """Queue the removal of a controller the subscriber has seen."""
+        if entity_id in self._sent or entity_id in self._pending:
+            self._pending[entity_id] = None
+            self._async_schedule()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop sending messages."""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self._pending.clear()
+
+    def _queue(self, entity_id: str, snapshot: dict[str, Any]) -> None:
+        """Keep the selected fields of a snapshot until the next message."""
+        if self._fields is not None:
+            snapshot = {field: snapshot[field] for field in self._fields}
+        self._pending[entity_id] = snapshot
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Send now, or arm a timer for when the interval has passed."""
+        if self._cancel_timer is not None:
+            return
+        delay = (
+            0
+            if self._last_flush is None
+            else self._last_flush + self._min_interval - self.hass.loop.time()
+        )
+        if delay <= 0:
+            self._async_flush()
+        else:
+            self._cancel_timer = async_call_later(self.hass, delay, self._async_flush)
+
+    @callback
+    def _async_flush(self, _: Any = None) -> None:
+        """Send the changes of all pending controllers in one message."""
+        self._cancel_timer = None
+        self._last_flush = self.hass.loop.time()
+        pending, self._pending = self._pending, {}
+
+        changes: dict[str, dict[str, Any] | None] = {}
+        for entity_id, snapshot in pending.items():
+            if snapshot is None:
+                if self._sent.pop(entity_id, None) is not None:
+                    changes[entity_id] = None
+                continue
+            if (previous := self._sent.get(entity_id)) is None:
+                changes[entity_id] = snapshot
+            elif delta := {
+                field: value
+                for field, value in snapshot.items()
+                if previous[field] != value
+            }:
+                changes[entity_id] = delta
+            self._sent[entity_id] = snapshot
+
+        if changes:
+            self._send({"controllers": changes})
+
+
+class TelemetryHub:
+    """Fan out controller snapshots to the websocket subscribers.
+
+    Controllers register a snapshot callback and notify the hub after every
+    control decision. Snapshots are only built while somebody is subscribed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the telemetry hub."""
+        self._controllers: dict[str, SnapshotCallback] = {}
+        self._subscriptions: list[TelemetrySubscription] = []
+
+    @callback
+    def async_register(
+        self, entity_id: str, snapshot: SnapshotCallback
+    ) -> CALLBACK_TYPE:
+        """Register a controller, return a function to unregister it."""
+        self._controllers[entity_id] = snapshot
+        self.async_publish(entity_id)
+
+        @callback
+        def remove() -> None:
+            if self._controllers.get(entity_id) is not snapshot:
+                return
+            del self._controllers[entity_id]
+            for subscription in self._subscriptions:
+                subscription.async_publish_removed(entity_id)
+
+        return remove
+
+    @callback
+    def async_publish(self, entity_id: str) -> None:
+        """Send the current snapshot of a controller to its subscribers."""
+        if not self._subscriptions or entity_id not in self._controllers:
+            return
+        snapshot: dict[str, Any] | None = None
+        for subscription in self._subscriptions:
+            if subscription.wants(entity_id):
+                # Built once and shared, subscribers never modify it
+                if snapshot is None:
+                    snapshot = self._controllers[entity_id]()
+                subscription.async_publish(entity_id, snapshot)
+
+    @callback
+    def async_subscribe(self, subscription: TelemetrySubscription) -> CALLBACK_TYPE:
+        """Add a subscriber and send it the current snapshot of every controller."""
+        self._subscriptions.append(subscription)
+        subscription.async_publish_all(
+            {
+                entity_id: snapshot()
+                for entity_id, snapshot in self._controllers.items()
+                if subscription.wants(entity_id)
+            }
+        )
+
+        @callback
+        def remove() -> None:
+            self._subscriptions.remove(subscription)
+            subscription.async_cancel()
+
+        return remove
+
+
+@singleton(DATA_TELEMETRY)
+@callback
+def async_get_telemetry(hass: HomeAssistant) -> TelemetryHub:
+    """Return the telemetry hub."""
+    return TelemetryHub()
@@ -0,0 +1,154 @@
+"""Decision trace for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+from array import array
+from enum import StrEnum
+from math import isnan, nan
+from typing import Any
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.util import dt as dt_util
+
+
+class TraceResult(StrEnum):
+    """Outcome of a single control pass."""
+
+    VALVE_UNAVAILABLE = "valve_unavailable"
+    VALVE_STATE_INVALID = "valve_state_invalid"
+    CYCLE_BLOCKED = "cycle_blocked"
+    TEMP_STEP_BLOCKED = "temp_step_blocked"
+    OFF = "off"
+    UNCHANGED = "unchanged"
+    WRITTEN = "written"
+    WRITE_FAILED = "write_failed"
+
+
+# Field names of a record, in the order they are stored.
+TRACE_FIELDS = (
+    "time",
+    "force",
+    "current_temperature",
+    "target_temperature",
+    "hvac_mode",
+    "preset_mode",
+    "valve_position",
+    "new_valve_position",
+    "result",
+)
+
+
+# Enum columns are stored as indexes into these tuples.
+_HVAC_MODES: tuple[HVACMode | None, ...] = (None, *HVACMode)
+_HVAC_MODE_CODES = {mode: code for code, mode in enumerate(_HVAC_MODES)}
+_RESULTS = tuple(TraceResult)
+_RESULT_CODES = {result: code for code, result in enumerate(_RESULTS)}
+
+
+def _encode(value: float | None) -> float:
+    """Store a missing number as NaN."""
+    return nan if value is None else value
+
+
+def _decode(value: float) -> float | None:
+    """Return None for a number stored as NaN."""
+    return None if isnan(value) else value
+
+
+class DecisionTrace:
+    """Fixed-size ring buffer of control decisions.
+
+    Every field is a preallocated column: numbers are packed doubles, with NaN
+    for a missing value, and the flags and enums are one byte codes. Recording
+    only overwrites the slots of the oldest record, nothing is allocated or
+    formatted until the buffer is exported.
+    """
+
+    __slots__ = (
+        "_capacity",
+        "_current_temps",
+        "_forces",
+        "_hvac_modes",
+        "_index",
+        "_new_valve_positions",
+        "_preset_codes",
+        "_preset_modes",
+        "_results",
+        "_size",
+        "_target_temps",
+        "_times",
+        "_valve_positions",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the trace buffer."""
+        self._capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._current_temps = array("d", bytes(8 * capacity))
+        self._target_temps = array("d", bytes(8 * capacity))
+        self._valve_positions = array("d", bytes(8 * capacity))
+        self._new_valve_positions = array("d", bytes(8 * capacity))
+        self._forces = array("B", bytes(capacity))
+        self._hvac_modes = array("B", bytes(capacity))
+        self._preset_modes = array("B", bytes(capacity))
+        self._results = array("B", bytes(capacity))
+        # Presets are configured per controller, their codes are assigned on first use
+        self._preset_codes: dict[str | None, int] = {}
+        self._index = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return self._size
+
+    def record(
+        self,
+        time: float,
+        force: bool,
+        current_temperature: float | None,
+        target_temperature: float | None,
+        hvac_mode: HVACMode | None,
+        preset_mode: str | None,
+        valve_position: float | None,
+        new_valve_position: float | None,
+        result: TraceResult,
+    ) -> None:
+        """Store a record, overwriting the oldest one if the buffer is full."""
+        if (preset_code := self._preset_codes.get(preset_mode)) is None:
+            preset_code = self._preset_codes[preset_mode] = len(self._preset_codes)
+
+        index = self._index
+        self._times[index] = time
+        self._forces[index] = force
+        self._current_temps[index] = _encode(current_temperature)
+        self._target_temps[index] = _encode(target_temperature)
+        self._hvac_modes[index] = _HVAC_MODE_CODES[hvac_mode]
+        self._preset_modes[index] = preset_code
+        self._valve_positions[index] = _encode(valve_position)
+        self._new_valve_positions[index] = _encode(new_valve_position)
+        self._results[index] = _RESULT_CODES[result]
+
+        self._index = (index + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def export(self, count: int | None = None) -> list[dict[str, Any]]:
+        """Return the last `count` records (oldest first) as JSON-serializable dicts."""
+        count = self._size if count is None else min(count, self._size)
+        preset_modes = list(self._preset_codes)
+        records: list[dict[str, Any]] = []
+        for offset in range(count, 0, -1):
+            index = (self._index - offset) % self._capacity
+            values = (
+                dt_util.utc_from_timestamp(self._times[index]).isoformat(),
+                bool(self._forces[index]),
+                _decode(self._current_temps[index]),
+                _decode(self._target_temps[index]),
+                _HVAC_MODES[self._hvac_modes[index]],
+                preset_modes[self._preset_modes[index]],
+                _decode(self._valve_positions[index]),
+                _decode(self._new_valve_positions[index]),
+                _RESULTS[self._results[index]],
+            )
+            records.append(dict(zip(TRACE_FIELDS, values, strict=True)))
+        return records
@@ -0,0 +1,63 @@
+"""Websocket API for the Thermostat Valve Controller integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_ENTITY_IDS,
+    ATTR_FIELDS,
+    ATTR_MIN_INTERVAL,
+    TELEMETRY_DEFAULT_INTERVAL,
+    TELEMETRY_MIN_INTERVAL,
+    WS_TYPE_SUBSCRIBE,
+)
+from .telemetry import TELEMETRY_FIELDS, TelemetrySubscription, async_get_telemetry
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUBSCRIBE,
+        vol.Optional(ATTR_ENTITY_IDS): cv.entity_ids,
+        vol.Optional(ATTR_FIELDS): vol.All(cv.ensure_list, [vol.In(TELEMETRY_FIELDS)]),
+        vol.Optional(ATTR_MIN_INTERVAL, default=TELEMETRY_DEFAULT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=TELEMETRY_MIN_INTERVAL)
+        ),
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the telemetry of all or the given controllers."""
+    msg_id: int = msg["id"]
+
+    @callback
+    def send(payload: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg_id, payload))
+
+    subscription = TelemetrySubscription(
+        hass,
+        send,
+        msg.get(ATTR_ENTITY_IDS),
+        msg.get(ATTR_FIELDS),
+        msg[ATTR_MIN_INTERVAL],
+    )
+    # The result has to go out before the first event
+    connection.send_result(msg_id)
+    connection.subscriptions[msg_id] = async_get_telemetry(hass).async_subscribe(
+        subscription
+    )
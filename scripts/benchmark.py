@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the per-event control path of the Thermostat Valve Controller.
+
+Covers parsing a sensor update, looking up valve positions in mappings of
+different sizes, the cycle gate of a control pass and the full path from a
+sensor state change to the state write, against a test Home Assistant
+instance with a stubbed valve service.
+
+Results can be saved as a JSON baseline and compared against it later, the
+exit code is 1 if a benchmark got slower than the threshold allows.
+
+Requires the test requirements (`scripts/setup`). Run from the repository root:
+
+    python3 scripts/benchmark.py --save benchmark.json
+    python3 scripts/benchmark.py --compare benchmark.json --threshold 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant import loader
+from homeassistant.components.climate import DATA_COMPONENT, HVACMode
+from homeassistant.const import CONF_NAME, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, ServiceCall, State
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.thermostatvalvecontroller.climate import (
+    ValveControllerClimate,
+)
+from custom_components.thermostatvalvecontroller.config_flow import (
+    VALVE_POSITION_SCHEMA,
+)
+from custom_components.thermostatvalvecontroller.const import (
+    CONF_HELPER_TYPE,
+    CONF_MIN_CYCLE_DURATION,
+    CONF_PRESETS,
+    CONF_TEMPERATURE_SENSOR_ENTITY_ID,
+    CONF_VALVE_ENTITY_ID,
+    DOMAIN,
+    HELPER_TYPE_THERMOSTAT,
+)
+from custom_components.thermostatvalvecontroller.mapping import (
+    ValveCurve,
+)
+
+SENSOR_ENTITY_ID = "sensor.benchmark_temperature"
+VALVE_ENTITY_ID = "input_number.benchmark_valve"
+MAPPING_SIZES = (3, 10, 50, 200)
+
+
+def _measure(
+    func: Callable[[], object], number: int, rounds: int, operations: int = 1
+) -> dict[str, float]:
+    """Time a synchronous function doing `operations` operations per call.
+
+    Returns nanoseconds per operation.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter_ns() - start) / (number * operations))
+    return {"median_ns": statistics.median(timings), "min_ns": min(timings)}
+
+
+async def _async_measure(
+    func: Callable[[], Awaitable[object]], number: int, rounds: int
+) -> dict[str, float]:
+    """Time a coroutine function, return nanoseconds per call (one operation)."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            await func()
+        timings.append((time.perf_counter_ns() - start) / number)
+    return {"median_ns": statistics.median(timings), "min_ns": min(timings)}
+
+
+async def _async_setup_controller(
+    hass: HomeAssistant, min_cycle_duration: dict | None
+) -> ValveControllerClimate:
+    """Set up a single thermostat and return its entity."""
+    options = {
+        CONF_NAME: "Benchmark",
+        CONF_HELPER_TYPE: HELPER_TYPE_THERMOSTAT,
+        CONF_TEMPERATURE_SENSOR_ENTITY_ID: SENSOR_ENTITY_ID,
+        CONF_VALVE_ENTITY_ID: VALVE_ENTITY_ID,
+        CONF_PRESETS["comfort"]: 21,
+        **VALVE_POSITION_SCHEMA({}),
+    }
+    if min_cycle_duration:
+        options[CONF_MIN_CYCLE_DURATION] = min_cycle_duration
+    entry = MockConfigEntry(domain=DOMAIN, title="Benchmark", options=options)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = hass.states.async_entity_ids("climate")[0]
+    entity = hass.data[DATA_COMPONENT].get_entity(entity_id)
+    assert isinstance(entity, ValveControllerClimate)
+    await entity.async_set_hvac_mode(HVACMode.HEAT)
+    return entity
+
+
+async def async_run_benchmarks(number: int, rounds: int) -> dict[str, dict]:
+    """Run all benchmarks."""
+    results: dict[str, dict] = {}
+    rng = random.Random(0)
+
+    # Mapping lookups
+    differences = [round(rng.uniform(-3, 3), 1) for _ in range(1000)]
+    for size in MAPPING_SIZES:
+        curve = ValveCurve(
+            {round(-1 + 3 * i / size, 3): 255 * i / size for i in range(size)}
+        )
+        results[f"calculate_valve_position[{size}]"] = _measure(
+            lambda curve=curve: [curve.position(d) for d in differences],
+            max(number // len(differences), 1),
+            rounds,
+            len(differences),
+        )
+
+    async with async_test_home_assistant() as hass:
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+
+        # Stubbed valve, writes are accepted but never echoed
+        async def _async_set_value(call: ServiceCall) -> None:
+            pass
+
+        hass.services.async_register("input_number", "set_value", _async_set_value)
+        hass.states.async_set(SENSOR_ENTITY_ID, "20.0")
+        hass.states.async_set(VALVE_ENTITY_ID, "0.0")
+
+        # Cycle gate, the valve just changed so every pass is blocked
+        entity = await _async_setup_controller(hass, {"hours": 1})
+        results["control_heating_cycle_gate"] = await _async_measure(
+            entity._async_control_heating, number, rounds
+        )
+        # Unloading cancels the deferred update scheduled by the gate
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            await hass.config_entries.async_unload(entry.entry_id)
+
+    async with async_test_home_assistant() as hass:
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+        hass.services.async_register("input_number", "set_value", _async_set_value)
+        hass.states.async_set(SENSOR_ENTITY_ID, "20.0")
+        hass.states.async_set(VALVE_ENTITY_ID, "0.0")
+        entity = await _async_setup_controller(hass, None)
+
+        # Sensor parsing
+        states = [State(SENSOR_ENTITY_ID, t) for t in ("20.1", "20.2", "20.3")]
+        results["update_temp"] = _measure(
+            lambda: [entity._async_update_temp(state) for state in states],
+            max(number // len(states), 1),
+            rounds,
+            len(states),
+        )
+
+        # Full path, alternating temperatures so every event writes the valve
+        events = [
+            Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": SENSOR_ENTITY_ID,
+                    "old_state": None,
+                    "new_state": State(SENSOR_ENTITY_ID, temperature),
+                },
+            )
+            for temperature in ("19.0", "20.5")
+        ]
+        iteration = 0
+
+        async def _async_sensor_changed() -> None:
+            nonlocal iteration
+            iteration += 1
+            await entity._async_sensor_changed(events[iteration % 2])
+
+        results["sensor_changed_to_state_write"] = await _async_measure(
+            _async_sensor_changed, number, rounds
+        )
+
+    return results
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Return the benchmarks that got slower than `threshold` allows."""
+    regressions = []
+    for name, result in results.items():
+        if (previous := baseline.get(name)) is None:
+            continue
+        change = result["median_ns"] / previous["median_ns"] - 1
+        if change > threshold:
+            regressions.append(f"{name}: {change:+.1%}")
+    return regressions
+
+
+def main() -> None:
+    """Parse the arguments, run the benchmarks and compare them to a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--number", type=int, default=2000, help="calls per timing round"
+    )
+    parser.add_argument("--rounds", type=int, default=7, help="timing rounds")
+    parser.add_argument("--save", type=Path, help="save the results as baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown compared to the baseline (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run_benchmarks(args.number, args.rounds))
+    for name, result in results.items():
+        print(f"{name:45} {result['median_ns']:>14,.0f} ns")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        regressions = compare(
+            results, json.loads(args.compare.read_text()), args.threshold
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""Load and soak test harness for the Thermostat Valve Controller integration.
+
+Sets up a large number of thermostat config entries against simulated valves
+and temperature sensors, runs them for a while and reports event loop lag,
+service calls, state writes and memory use per controller. Memory is reported
+as the total allocated during setup, as the total still allocated at the end
+of the soak (trace buffers, latency trackers and pending tasks filled up by
+then) and as the size of the controller's own objects (entity, configuration,
+runtime state, decision trace and latency tracker), with the valve curves that
+controllers share counted once.
+
+Memory is traced through the soak by default, which slows down allocations
+and inflates the loop lag. Pass `--trace-setup-only` for undistorted timings,
+the memory at the end of the soak is then not reported.
+
+The valves are `input_number` entities backed by a fake `set_value` service
+that echoes the new position after a configurable latency and drops a
+configurable share of the writes. The sensors replay synthetic temperature
+curves (a slow sine wave per room plus some noise).
+
+Requires the test requirements (`scripts/setup`). Run from the repository root:
+
+    python3 scripts/loadtest.py --controllers 500 1000 2000 --duration 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant import loader
+from homeassistant.components.climate import DATA_COMPONENT, HVACMode
+from homeassistant.const import CONF_NAME, EVENT_STATE_CHANGED
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    ServiceCall,
+    callback,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.thermostatvalvecontroller.climate import (
+    ValveControllerClimate,
+)
+from custom_components.thermostatvalvecontroller.config_flow import (
+    VALVE_POSITION_SCHEMA,
+)
+from custom_components.thermostatvalvecontroller.const import (
+    CONF_HELPER_TYPE,
+    CONF_MAX_TEMP,
+    CONF_MIN_CYCLE_DURATION,
+    CONF_MIN_TEMP,
+    CONF_PRECISION,
+    CONF_PRESETS,
+    CONF_TARGET_TEMP_STEP,
+    CONF_TEMPERATURE_SENSOR_ENTITY_ID,
+    CONF_VALVE_EMERGENCY_POSITION,
+    CONF_VALVE_ENTITY_ID,
+    DOMAIN,
+    HELPER_TYPE_THERMOSTAT,
+)
+
+# Interval of the event loop lag probe in seconds
+LAG_PROBE_INTERVAL = 0.05
+
+
+@dataclass
+class LoadTestResult:
+    """Measurements of a single load test run."""
+
+    controllers: int
+    setup_seconds: float
+    memory_per_controller_bytes: float
+    memory_per_controller_after_soak_bytes: float | None
+    controller_object_bytes: float
+    shared_curve_bytes: int
+    duration_seconds: float
+    sensor_updates: int
+    service_calls: int
+    dropped_writes: int
+    state_writes_per_second: float
+    loop_lag_p50_ms: float
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+
+
+class SimulatedValves:
+    """Valves that report a written position after a delay, or lose the write."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rng: random.Random,
+        echo_latency: float,
+        drop_rate: float,
+    ) -> None:
+        """Initialize the simulated valves."""
+        self.hass = hass
+        self._rng = rng
+        self._echo_latency = echo_latency
+        self._drop_rate = drop_rate
+        self.calls = 0
+        self.dropped = 0
+
+    @callback
+    def async_register(self) -> None:
+        """Register the fake `input_number.set_value` service."""
+        self.hass.services.async_register(
+            "input_number", "set_value", self._async_set_value
+        )
+
+    async def _async_set_value(self, call: ServiceCall) -> None:
+        """Echo the new position after the latency, unless the write is dropped."""
+        self.calls += 1
+        if self._rng.random() < self._drop_rate:
+            self.dropped += 1
+            return
+
+        entity_ids = call.data["entity_id"]
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        for entity_id in entity_ids:
+            self.hass.loop.call_later(
+                self._echo_latency * self._rng.uniform(0.5, 1.5),
+                self.hass.states.async_set,
+                entity_id,
+                str(float(call.data["value"])),
+            )
+
+
+class SimulatedSensors:
+    """Temperature sensors replaying a synthetic curve per room."""
+
+    def __init__(
+        self, hass: HomeAssistant, rng: random.Random, count: int, interval: float
+    ) -> None:
+        """Initialize the simulated sensors."""
+        self.hass = hass
+        self._rng = rng
+        self._interval = interval
+        # (base temperature, amplitude, period in seconds, phase) per room
+        self._curves = [
+            (
+                rng.uniform(18.5, 22.5),
+                rng.uniform(0.5, 2.0),
+                rng.uniform(300, 1800),
+                rng.uniform(0, 2 * math.pi),
+            )
+            for _ in range(count)
+        ]
+        self.updates = 0
+
+    @staticmethod
+    def entity_id(index: int) -> str:
+        """Return the entity id of a sensor."""
+        return f"sensor.load_temperature_{index}"
+
+    def temperature(self, index: int, now: float) -> float:
+        """Return the temperature of a room at a point in time."""
+        base, amplitude, period, phase = self._curves[index]
+        noise = self._rng.gauss(0, 0.05)
+        wave = amplitude * math.sin(2 * math.pi * now / period + phase)
+        return round(base + wave + noise, 1)
+
+    @callback
+    def async_set_initial_states(self) -> None:
+        """Set the first reading of every sensor."""
+        for index in range(len(self._curves)):
+            self.hass.states.async_set(
+                self.entity_id(index), str(self.temperature(index, 0))
+            )
+
+    async def async_run(self) -> None:
+        """Update every sensor once per interval, spread evenly over the interval."""
+        start = time.monotonic()
+        spacing = self._interval / len(self._curves)
+        index = 0
+        while True:
+            await asyncio.sleep(spacing)
+            self.hass.states.async_set(
+                self.entity_id(index),
+                str(self.temperature(index, time.monotonic() - start)),
+            )
+            self.updates += 1
+            index = (index + 1) % len(self._curves)
+
+
+async def _async_probe_loop_lag(samples: list[float]) -> None:
+    """Measure how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(loop.time() - start - LAG_PROBE_INTERVAL)
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    """Return a percentile of the samples (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * percentile), len(ordered) - 1)]
+
+
+def _controller_footprint(
+    entities: list[ValveControllerClimate],
+) -> tuple[float, int]:
+    """Return the size of the objects owned by each controller and of the shared curves.
+
+    Sizes are shallow, the entity's attribute dict is counted but not the
+    Home Assistant helpers it references.
+    """
+    own = 0
+    curves: dict[int, int] = {}
+    for entity in entities:
+        config = entity._config
+        trace = entity._trace
+        latency = entity._valve_latency
+        own += sum(
+            sys.getsizeof(obj)
+            for obj in (
+                entity,
+                entity.__dict__,
+                entity._runtime,
+                config,
+                config.preset_names,
+                config.preset_temps,
+                config.preset_valve_curves,
+                trace,
+                *(getattr(trace, slot) for slot in trace.__slots__),
+                latency,
+                latency.p50,
+                latency.p95,
+            )
+        )
+        for curve in (config.valve_curve, *config.preset_valve_curves):
+            if curve is not None:
+                curves[id(curve)] = (
+                    sys.getsizeof(curve)
+                    + sys.getsizeof(curve.thresholds)
+                    + sys.getsizeof(curve.positions)
+                )
+    return own / max(len(entities), 1), sum(curves.values())
+
+
+def _entry_options(index: int, min_cycle_duration: float) -> dict:
+    """Return the options of a simulated thermostat."""
+    options = {
+        CONF_NAME: f"Load test {index}",
+        CONF_HELPER_TYPE: HELPER_TYPE_THERMOSTAT,
+        CONF_TEMPERATURE_SENSOR_ENTITY_ID: SimulatedSensors.entity_id(index),
+        CONF_VALVE_ENTITY_ID: f"input_number.load_valve_{index}",
+        CONF_PRECISION: 0.1,
+        CONF_VALVE_EMERGENCY_POSITION: 25,
+        CONF_MIN_TEMP: 7,
+        CONF_MAX_TEMP: 35,
+        CONF_TARGET_TEMP_STEP: 0.5,
+        CONF_PRESETS["comfort"]: 21,
+        CONF_PRESETS["eco"]: 19,
+        **VALVE_POSITION_SCHEMA({}),
+    }
+    if min_cycle_duration:
+        options[CONF_MIN_CYCLE_DURATION] = {"seconds": min_cycle_duration}
+    return options
+
+
+async def async_run_load_test(
+    controllers: int, args: argparse.Namespace
+) -> LoadTestResult:
+    """Run one load test with the given number of controllers."""
+    rng = random.Random(args.seed)
+
+    async with async_test_home_assistant() as hass:
+        # Allow loading this integration from the repository
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+
+        valves = SimulatedValves(hass, rng, args.echo_latency, args.drop_rate)
+        valves.async_register()
+        sensors = SimulatedSensors(hass, rng, controllers, args.sensor_interval)
+        sensors.async_set_initial_states()
+        for index in range(controllers):
+            hass.states.async_set(f"input_number.load_valve_{index}", "0.0")
+
+        gc.collect()
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        setup_start = time.monotonic()
+
+        for index in range(controllers):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title=f"Load test {index}",
+                options=_entry_options(index, args.min_cycle_duration),
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        setup_seconds = time.monotonic() - setup_start
+        gc.collect()
+        memory_per_controller = (
+            tracemalloc.get_traced_memory()[0] - memory_before
+        ) / controllers
+        if args.trace_setup_only:
+            tracemalloc.stop()
+        controller_object_bytes, shared_curve_bytes = _controller_footprint(
+            [
+                entity
+                for entity in hass.data[DATA_COMPONENT].entities
+                if isinstance(entity, ValveControllerClimate)
+            ]
+        )
+
+        await hass.services.async_call(
+            "climate",
+            "set_hvac_mode",
+            {"entity_id": "all", "hvac_mode": HVACMode.HEAT},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+        # Soak
+        state_writes = 0
+
+        @callback
+        def _async_count_state_write(event: Event[EventStateChangedData]) -> None:
+            nonlocal state_writes
+            if event.data["entity_id"].startswith("climate."):
+                state_writes += 1
+
+        remove_listener = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_count_state_write
+        )
+        valves.calls = valves.dropped = 0
+        lag_samples: list[float] = []
+        tasks = [
+            hass.loop.create_task(sensors.async_run()),
+            hass.loop.create_task(_async_probe_loop_lag(lag_samples)),
+        ]
+        soak_start = time.monotonic()
+        await asyncio.sleep(args.duration)
+        duration = time.monotonic() - soak_start
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        remove_listener()
+
+        # Steady state, after the buffers of the controllers had time to fill up
+        memory_per_controller_after_soak = None
+        if tracemalloc.is_tracing():
+            gc.collect()
+            memory_per_controller_after_soak = round(
+                (tracemalloc.get_traced_memory()[0] - memory_before) / controllers
+            )
+            tracemalloc.stop()
+
+        return LoadTestResult(
+            controllers=controllers,
+            setup_seconds=round(setup_seconds, 2),
+            memory_per_controller_bytes=round(memory_per_controller),
+            memory_per_controller_after_soak_bytes=memory_per_controller_after_soak,
+            controller_object_bytes=round(controller_object_bytes),
+            shared_curve_bytes=shared_curve_bytes,
+            duration_seconds=round(duration, 2),
+            sensor_updates=sensors.updates,
+            service_calls=valves.calls,
+            dropped_writes=valves.dropped,
+            state_writes_per_second=round(state_writes / duration, 2),
+            loop_lag_p50_ms=round(_percentile(lag_samples, 0.5) * 1000, 2),
+            loop_lag_p99_ms=round(_percentile(lag_samples, 0.99) * 1000, 2),
+            loop_lag_max_ms=round(max(lag_samples, default=0) * 1000, 2),
+        )
+
+
+async def async_main(args: argparse.Namespace) -> list[LoadTestResult]:
+    """Run a load test for every requested number of controllers."""
+    results = []
+    for controllers in args.controllers:
+        result = await async_run_load_test(controllers, args)
+        print(json.dumps(asdict(result)), flush=True)
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    """Parse the arguments and run the load tests."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--controllers",
+        type=int,
+        nargs="+",
+        default=[500, 1000, 2000],
+        help="number of controllers, runs one test per value",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=60, help="soak duration in seconds"
+    )
+    parser.add_argument(
+        "--sensor-interval",
+        type=float,
+        default=30,
+        help="seconds between two readings of the same sensor",
+    )
+    parser.add_argument(
+        "--echo-latency",
+        type=float,
+        default=1.0,
+        help="mean seconds until a valve reports a written position",
+    )
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.0,
+        help="share of valve writes that are lost (0-1)",
+    )
+    parser.add_argument(
+        "--min-cycle-duration",
+        type=float,
+        default=0,
+        help="minimum cycle duration of the controllers in seconds",
+    )
+    parser.add_argument(
+        "--trace-setup-only",
+        action="store_true",
+        help="only trace memory during setup, for timings without tracing overhead",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_main(args))
+    if args.output:
+        args.output.write_text(json.dumps([asdict(r) for r in results], indent=2))
+
+
+if __name__ == "__main__":
+    main()
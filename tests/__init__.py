@@ -0,0 +1,5 @@
+"""Tests for the Thermostat Valve Controller integration."""
+
+SENSOR = "sensor.temperature"
+VALVE = "input_number.valve"
+ENTITY_ID = "climate.living_room"
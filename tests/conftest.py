@@ -0,0 +1,52 @@
+"""Fixtures for the Thermostat Valve Controller tests."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.thermostatvalvecontroller.const import (
+    CONF_HELPER_TYPE,
+    CONF_POSITION_MAPPING,
+    CONF_TEMPERATURE_SENSOR_ENTITY_ID,
+    CONF_VALVE_ENTITY_ID,
+    DOMAIN,
+    HELPER_TYPE_THERMOSTAT,
+)
+
+from . import SENSOR, VALVE
+
+SetupThermostat = Callable[..., Awaitable[MockConfigEntry]]
+
+
+@pytest.fixture
+def setup_thermostat(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> SetupThermostat:
+    """Return a function setting up the living room thermostat.
+
+    Keyword arguments are added to the options of the config entry.
+    """
+
+    async def _setup(**options: Any) -> MockConfigEntry:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title="Living room",
+            options={
+                CONF_NAME: "Living room",
+                CONF_HELPER_TYPE: HELPER_TYPE_THERMOSTAT,
+                CONF_TEMPERATURE_SENSOR_ENTITY_ID: SENSOR,
+                CONF_VALVE_ENTITY_ID: VALVE,
+                CONF_POSITION_MAPPING: {"-1": 0, "0": 50, "1": 100},
+                **options,
+            },
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        return entry
+
+    return _setup
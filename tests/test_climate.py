@@ -0,0 +1,131 @@
+"""Tests for the Thermostat Valve Controller climate entity."""
+
+import pytest
+from homeassistant.components.climate import (
+    ATTR_HVAC_ACTION,
+    ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_PRESET_MODE,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.components.climate import (
+    DOMAIN as CLIMATE_DOMAIN,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    async_mock_service,
+)
+
+from custom_components.thermostatvalvecontroller.const import (
+    CONF_POSITION_MAPPING,
+    CONF_PRESET_POSITION_MAPPINGS,
+    CONF_PRESETS,
+)
+from custom_components.thermostatvalvecontroller.demand import async_get_heat_demand
+
+from . import ENTITY_ID, SENSOR, VALVE
+from .conftest import SetupThermostat
+
+pytestmark = pytest.mark.usefixtures("enable_custom_integrations")
+
+
+async def test_heat_demand_uses_active_curve(
+    hass: HomeAssistant, setup_thermostat: SetupThermostat
+) -> None:
+    """Test the heat demand and hvac action follow the curve of the preset."""
+    async_mock_service(hass, "input_number", "set_value")
+    hass.states.async_set(SENSOR, "15")
+    hass.states.async_set(VALVE, "100")
+    await setup_thermostat(
+        **{
+            CONF_PRESETS["eco"]: 19,
+            CONF_PRESET_POSITION_MAPPINGS: {"eco": {"-1": 20, "1": 255}},
+        }
+    )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_HVAC_MODE: HVACMode.HEAT},
+        blocking=True,
+    )
+    heat_demand = async_get_heat_demand(hass)
+    assert heat_demand.weighted_demand == pytest.approx(100)
+
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_PRESET_MODE: "eco"},
+        blocking=True,
+    )
+    # Same position, but relative to the larger range of the eco curve
+    assert heat_demand.weighted_demand == pytest.approx(80 / 235 * 100)
+
+    hass.states.async_set(VALVE, "255")
+    await hass.async_block_till_done()
+    assert heat_demand.weighted_demand == pytest.approx(100)
+
+    # Below the closed position of the eco curve
+    hass.states.async_set(VALVE, "10")
+    await hass.async_block_till_done()
+    assert heat_demand.weighted_demand == 0
+    assert heat_demand.open_count == 0
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HVAC_ACTION] == HVACAction.IDLE
+
+
+async def test_invalid_preset_mapping_uses_default(
+    hass: HomeAssistant, setup_thermostat: SetupThermostat
+) -> None:
+    """Test a saved preset mapping with invalid values falls back to the default."""
+    async_mock_service(hass, "input_number", "set_value")
+    hass.states.async_set(SENSOR, "15")
+    hass.states.async_set(VALVE, "100")
+    await setup_thermostat(
+        **{
+            CONF_PRESETS["eco"]: 19,
+            CONF_PRESET_POSITION_MAPPINGS: {"eco": {"0": None}},
+        }
+    )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_PRESET_MODE: "eco"},
+        blocking=True,
+    )
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_PRESET_MODE] == "eco"
+    assert async_get_heat_demand(hass).weighted_demand == pytest.approx(100)
+
+
+async def test_off_closes_to_active_curve(
+    hass: HomeAssistant, setup_thermostat: SetupThermostat
+) -> None:
+    """Test turning off closes the valve to the minimum of the preset curve."""
+    set_value = async_mock_service(hass, "input_number", "set_value")
+    hass.states.async_set(SENSOR, "15")
+    hass.states.async_set(VALVE, "100")
+    await setup_thermostat(
+        **{
+            CONF_POSITION_MAPPING: {"-1": 20, "1": 100},
+            CONF_PRESETS["eco"]: 19,
+            CONF_PRESET_POSITION_MAPPINGS: {"eco": {"-1": 5, "1": 100}},
+        }
+    )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_PRESET_MODE: "eco"},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_HVAC_MODE: HVACMode.OFF},
+        blocking=True,
+    )
+    assert set_value[-1].data["value"] == 5
+
+    hass.states.async_set(VALVE, "5")
+    await hass.async_block_till_done()
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HVAC_ACTION] == HVACAction.OFF
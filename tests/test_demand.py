@@ -0,0 +1,236 @@
+"""Tests for the house-wide heat demand."""
+
+from datetime import timedelta
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STARTED,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import CoreState, HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.thermostatvalvecontroller.demand import (
+    BoilerSwitch,
+    HeatDemandAggregator,
+)
+
+BOILER = "switch.boiler"
+
+
+def test_aggregator_totals() -> None:
+    """Test the totals follow updates and removals."""
+    aggregator = HeatDemandAggregator()
+    assert aggregator.weighted_demand is None
+    assert aggregator.maximum is None
+
+    aggregator.async_update("a", 100, 0, 100)
+    aggregator.async_update("b", 50, 0, 100)
+    aggregator.async_update("c", 0, 0, 100)
+    assert aggregator.controller_count == 3
+    assert aggregator.total == 150
+    assert aggregator.maximum == 100
+    assert aggregator.open_count == 2
+    assert aggregator.weighted_demand == pytest.approx(50)
+
+    aggregator.async_update("a", 20, 0, 100)
+    assert aggregator.total == 70
+    assert aggregator.maximum == 50
+    assert aggregator.weighted_demand == pytest.approx(70 / 3)
+
+    aggregator.async_remove("b")
+    assert aggregator.maximum == 20
+    assert aggregator.open_count == 1
+
+    aggregator.async_remove("a")
+    aggregator.async_remove("c")
+    assert aggregator.controller_count == 0
+    assert aggregator.total == 0
+    assert aggregator.maximum is None
+    assert aggregator.weighted_demand is None
+
+
+def test_aggregator_maximum_with_duplicates() -> None:
+    """Test the maximum stays while another controller is at the same position."""
+    aggregator = HeatDemandAggregator()
+    aggregator.async_update("a", 80, 0, 100)
+    aggregator.async_update("b", 80, 0, 100)
+    aggregator.async_update("a", 10, 0, 100)
+    assert aggregator.maximum == 80
+    aggregator.async_update("b", 10, 0, 100)
+    assert aggregator.maximum == 10
+
+
+def test_aggregator_listeners() -> None:
+    """Test listeners are only called on changes."""
+    aggregator = HeatDemandAggregator()
+    calls = []
+    remove = aggregator.async_add_listener(lambda: calls.append(None))
+
+    aggregator.async_update("a", 50, 0, 100)
+    aggregator.async_update("a", 50, 0, 100)
+    aggregator.async_remove("b")
+    assert len(calls) == 1
+
+    remove()
+    aggregator.async_update("a", 60, 0, 100)
+    assert len(calls) == 1
+
+
+async def test_boiler_follows_demand(hass: HomeAssistant) -> None:
+    """Test the boiler is switched when the demand crosses the threshold."""
+    turn_on = async_mock_service(hass, "switch", "turn_on")
+    turn_off = async_mock_service(hass, "switch", "turn_off")
+    hass.states.async_set(BOILER, STATE_OFF)
+    aggregator = HeatDemandAggregator()
+    stop = BoilerSwitch(hass, aggregator, BOILER, 10, None).async_start()
+
+    aggregator.async_update("a", 50, 0, 100)
+    await hass.async_block_till_done()
+    assert len(turn_on) == 1
+
+    hass.states.async_set(BOILER, STATE_ON)
+    await hass.async_block_till_done()
+    aggregator.async_update("a", 0, 0, 100)
+    await hass.async_block_till_done()
+    assert len(turn_off) == 1
+    stop()
+
+
+async def test_boiler_waits_for_start(hass: HomeAssistant) -> None:
+    """Test the boiler is left alone until all thermostats could report."""
+    turn_off = async_mock_service(hass, "switch", "turn_off")
+    hass.states.async_set(BOILER, STATE_ON)
+    hass.set_state(CoreState.starting)
+    aggregator = HeatDemandAggregator()
+    stop = BoilerSwitch(hass, aggregator, BOILER, 10, None).async_start()
+    await hass.async_block_till_done()
+
+    # The thermostats report their valves when Home Assistant starts
+    aggregator.async_update("a", 0, 0, 100)
+    aggregator.async_update("b", 50, 0, 100)
+    await hass.async_block_till_done()
+    assert not turn_off
+
+    hass.set_state(CoreState.running)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+    assert not turn_off
+
+    aggregator.async_update("b", 0, 0, 100)
+    await hass.async_block_till_done()
+    assert len(turn_off) == 1
+    stop()
+
+
+async def test_boiler_unknown_demand(hass: HomeAssistant) -> None:
+    """Test the boiler is not switched off without any known valve position."""
+    turn_off = async_mock_service(hass, "switch", "turn_off")
+    hass.states.async_set(BOILER, STATE_ON)
+    aggregator = HeatDemandAggregator()
+    stop = BoilerSwitch(hass, aggregator, BOILER, 10, None).async_start()
+    await hass.async_block_till_done()
+    assert not turn_off
+
+    aggregator.async_update("a", 50, 0, 100)
+    aggregator.async_remove("a")
+    await hass.async_block_till_done()
+    assert not turn_off
+    stop()
+
+
+async def test_boiler_skips_repeated_calls(hass: HomeAssistant) -> None:
+    """Test demand changes do not repeat a call the boiler has not answered yet."""
+    turn_on = async_mock_service(hass, "switch", "turn_on")
+    hass.states.async_set(BOILER, STATE_OFF)
+    aggregator = HeatDemandAggregator()
+    stop = BoilerSwitch(hass, aggregator, BOILER, 10, None).async_start()
+
+    for position in range(20, 100, 10):
+        aggregator.async_update("a", position, 0, 100)
+    await hass.async_block_till_done()
+    assert len(turn_on) == 1
+
+    # Once the boiler followed, a later change of mind is sent again
+    hass.states.async_set(BOILER, STATE_ON)
+    await hass.async_block_till_done()
+    hass.states.async_set(BOILER, STATE_OFF)
+    await hass.async_block_till_done()
+    assert len(turn_on) == 2
+    stop()
+
+
+async def test_boiler_appears_later(hass: HomeAssistant) -> None:
+    """Test a boiler that does not exist at start is switched once it shows up."""
+    turn_on = async_mock_service(hass, "switch", "turn_on")
+    aggregator = HeatDemandAggregator()
+    aggregator.async_update("a", 50, 0, 100)
+    stop = BoilerSwitch(hass, aggregator, BOILER, 10, None).async_start()
+    await hass.async_block_till_done()
+    assert not turn_on
+
+    hass.states.async_set(BOILER, STATE_OFF)
+    await hass.async_block_till_done()
+    assert len(turn_on) == 1
+    stop()
+
+
+async def test_boiler_external_toggle(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test an external toggle is reverted after the minimum cycle duration."""
+    turn_on = async_mock_service(hass, "switch", "turn_on")
+    hass.states.async_set(BOILER, STATE_ON)
+    aggregator = HeatDemandAggregator()
+    aggregator.async_update("a", 50, 0, 100)
+    stop = BoilerSwitch(
+        hass, aggregator, BOILER, 10, timedelta(minutes=5)
+    ).async_start()
+
+    hass.states.async_set(BOILER, STATE_OFF)
+    await hass.async_block_till_done()
+    assert not turn_on
+
+    freezer.tick(timedelta(minutes=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(turn_on) == 1
+    stop()
+
+
+async def test_boiler_unavailable(hass: HomeAssistant) -> None:
+    """Test an unavailable boiler is not switched."""
+    turn_on = async_mock_service(hass, "switch", "turn_on")
+    hass.states.async_set(BOILER, STATE_UNAVAILABLE)
+    aggregator = HeatDemandAggregator()
+    stop = BoilerSwitch(hass, aggregator, BOILER, 10, None).async_start()
+
+    aggregator.async_update("a", 50, 0, 100)
+    await hass.async_block_till_done()
+    assert not turn_on
+
+    hass.states.async_set(BOILER, STATE_OFF)
+    await hass.async_block_till_done()
+    assert len(turn_on) == 1
+    stop()
+
+
+def test_aggregator_range_change() -> None:
+    """Test a new range at the same position updates the demand and is clamped."""
+    aggregator = HeatDemandAggregator()
+    aggregator.async_update("a", 100, 0, 100)
+    aggregator.async_update("a", 100, 0, 200)
+    assert aggregator.weighted_demand == pytest.approx(50)
+
+    aggregator.async_update("a", 100, 0, 50)
+    assert aggregator.weighted_demand == pytest.approx(100)
+
+    aggregator.async_update("a", 10, 20, 50)
+    assert aggregator.weighted_demand == 0
+    assert aggregator.open_count == 0
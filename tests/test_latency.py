@@ -0,0 +1,91 @@
+"""Tests for the valve latency tracking."""
+
+import random
+import statistics
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.thermostatvalvecontroller.latency import (
+    P2Quantile,
+    ValveLatencyTracker,
+)
+
+
+@pytest.mark.parametrize(
+    ("p", "samples", "expected"),
+    [
+        (0.5, [3.0], 3.0),
+        (0.95, [1.0, 2.0, 3.0, 4.0], 4.0),
+        (0.95, [5.0, 1.0, 4.0, 2.0, 3.0], 5.0),
+        (0.5, [5.0, 1.0, 4.0, 2.0, 3.0], 3.0),
+    ],
+)
+def test_p2_few_samples(p: float, samples: list[float], expected: float) -> None:
+    """Test the estimate is taken from the sorted samples until there are enough."""
+    quantile = P2Quantile(p)
+    for sample in samples:
+        quantile.add(sample)
+    assert quantile.count == len(samples)
+    assert quantile.value == expected
+
+
+def test_p2_no_samples() -> None:
+    """Test there is no estimate without samples."""
+    assert P2Quantile(0.5).value is None
+
+
+@pytest.mark.parametrize("p", [0.5, 0.95])
+def test_p2_converges(p: float) -> None:
+    """Test the estimate is close to the actual quantile of a large sample."""
+    rng = random.Random(0)
+    samples = [rng.lognormvariate(0, 0.5) for _ in range(10000)]
+    quantile = P2Quantile(p)
+    for sample in samples:
+        quantile.add(sample)
+
+    expected = statistics.quantiles(samples, n=100)[round(p * 100) - 1]
+    assert quantile.value == pytest.approx(expected, rel=0.05)
+
+
+def test_tracker_records_round_trip(freezer: FrozenDateTimeFactory) -> None:
+    """Test a reported position matching the written one is recorded."""
+    tracker = ValveLatencyTracker(120)
+    tracker.start(50.0)
+    freezer.tick(2)
+    tracker.complete(50.0)
+    assert tracker.count == 1
+    assert tracker.p50.value == pytest.approx(2)
+
+
+def test_tracker_ignores_other_positions(freezer: FrozenDateTimeFactory) -> None:
+    """Test a change to a different position does not complete the write."""
+    tracker = ValveLatencyTracker(120)
+    tracker.start(50.0)
+    freezer.tick(1)
+    tracker.complete(20.0)
+    assert tracker.count == 0
+
+    freezer.tick(1)
+    tracker.complete(50.0)
+    assert tracker.count == 1
+    assert tracker.p50.value == pytest.approx(2)
+
+
+def test_tracker_cancel(freezer: FrozenDateTimeFactory) -> None:
+    """Test a failed write is not completed by a later change."""
+    tracker = ValveLatencyTracker(120)
+    tracker.start(50.0)
+    tracker.cancel()
+    freezer.tick(30)
+    tracker.complete(50.0)
+    assert tracker.count == 0
+
+
+def test_tracker_ignores_late_reports(freezer: FrozenDateTimeFactory) -> None:
+    """Test a report after the maximum sample duration is not recorded."""
+    tracker = ValveLatencyTracker(120)
+    tracker.start(50.0)
+    freezer.tick(121)
+    tracker.complete(50.0)
+    assert tracker.count == 0
@@ -0,0 +1,64 @@
+"""Tests for the valve position mappings."""
+
+import pytest
+from homeassistant.helpers.schema_config_entry_flow import SchemaFlowError
+
+from custom_components.thermostatvalvecontroller.config_flow import (
+    validate_position_mappings,
+)
+from custom_components.thermostatvalvecontroller.const import (
+    CONF_POSITION_MAPPING,
+    CONF_PRESET_POSITION_MAPPINGS,
+)
+from custom_components.thermostatvalvecontroller.mapping import compile_mapping
+
+
+def test_curve_positions() -> None:
+    """Test the position of the highest threshold below the difference is used."""
+    curve = compile_mapping({"1": 100, "-1": 10, "0": 50})
+    assert (curve.minimum, curve.maximum) == (10, 100)
+    assert curve.position(-2) == 10
+    assert curve.position(-0.5) == 10
+    assert curve.position(0) == 10
+    assert curve.position(0.5) == 50
+    assert curve.position(1) == 100
+    assert curve.position(5) == 100
+
+
+@pytest.mark.parametrize(
+    "mapping",
+    [
+        {},
+        [1, 2],
+        None,
+        {"0": "open"},
+        {"zero": 50},
+        {"0": None},
+        {"0": [1]},
+        {"0": "nan"},
+        {"inf": 50},
+    ],
+)
+def test_compile_invalid(mapping: object) -> None:
+    """Test invalid mappings raise ValueError."""
+    with pytest.raises(ValueError):
+        compile_mapping(mapping)
+
+
+async def test_validate_preset_mapping_of_wrong_type() -> None:
+    """Test a preset mapping with non-numeric values is reported as invalid."""
+    with pytest.raises(SchemaFlowError, match="invalid_preset_position_mappings"):
+        await validate_position_mappings(
+            None,
+            {
+                CONF_POSITION_MAPPING: {"0": 50},
+                CONF_PRESET_POSITION_MAPPINGS: {"eco": {"0": None}},
+            },
+        )
+
+
+def test_identical_mappings_share_a_curve() -> None:
+    """Test mappings with the same points compile to the same curve."""
+    curve = compile_mapping({"-1": 0, "0": 50, "1": 100})
+    assert compile_mapping({"1.0": 100.0, "-1": 0, "0.0": "50"}) is curve
+    assert compile_mapping({"-1": 0, "0": 50, "1": 90}) is not curve
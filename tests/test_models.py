@@ -0,0 +1,71 @@
+"""Tests for the controller configuration records."""
+
+from array import array
+
+import pytest
+from homeassistant.components.climate.const import PRESET_NONE
+
+from custom_components.thermostatvalvecontroller.mapping import (
+    ValveCurve,
+    compile_mapping,
+)
+from custom_components.thermostatvalvecontroller.models import ControllerConfig
+
+DEFAULT_CURVE = compile_mapping({"-1": 0, "0": 50, "1": 100})
+ECO_CURVE = compile_mapping({"-1": 0, "1": 60})
+
+
+def _config(
+    presets: dict[str, float], curves: dict[str, ValveCurve]
+) -> ControllerConfig:
+    """Return a configuration with the given preset temperatures and curves."""
+    return ControllerConfig(
+        valve_entity_id="input_number.valve",
+        temp_sensor_entity_id="sensor.temperature",
+        valve_curve=DEFAULT_CURVE,
+        preset_names=tuple(presets),
+        preset_temps=array("d", presets.values()),
+        preset_valve_curves=tuple(curves.get(preset) for preset in presets),
+        min_cycle_duration=None,
+        valve_emergency_position=None,
+        min_temp_change_step=0,
+        adaptive_timing=False,
+        schedule=None,
+    )
+
+
+def test_preset_temperature() -> None:
+    """Test the temperature of a preset is looked up by name."""
+    config = _config({"eco": 19, "comfort": 21}, {})
+    assert config.preset_temperature("eco") == 19
+    assert config.preset_temperature("comfort") == 21
+    assert config.preset_temperature(PRESET_NONE) is None
+    assert config.preset_temperature(None) is None
+
+
+@pytest.mark.parametrize(
+    ("temperature", "preset"),
+    [(19, "sleep"), (21, "comfort"), (20, PRESET_NONE)],
+)
+def test_preset_for_temperature(temperature: float, preset: str) -> None:
+    """Test the last preset with a temperature wins, like the inverted dict did."""
+    presets = {"eco": 19, "comfort": 21, "sleep": 19}
+    config = _config(presets, {})
+    assert config.preset_for_temperature(temperature) == preset
+    assert {v: k for k, v in presets.items()}.get(temperature, PRESET_NONE) == preset
+
+
+@pytest.mark.parametrize(
+    ("preset", "curve"),
+    [
+        ("eco", ECO_CURVE),
+        ("comfort", DEFAULT_CURVE),
+        (PRESET_NONE, DEFAULT_CURVE),
+        (None, DEFAULT_CURVE),
+        ("unknown", DEFAULT_CURVE),
+    ],
+)
+def test_valve_curve_for(preset: str | None, curve: ValveCurve) -> None:
+    """Test presets without an own curve fall back to the default curve."""
+    config = _config({"eco": 19, "comfort": 21}, {"eco": ECO_CURVE})
+    assert config.valve_curve_for(preset) is curve
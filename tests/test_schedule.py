@@ -0,0 +1,145 @@
+"""Tests for the weekly preset schedules."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.thermostatvalvecontroller.schedule import (
+    ScheduleEngine,
+    active_preset,
+    compile_schedule,
+    next_transition,
+)
+
+
+def _local(*args: int) -> datetime:
+    """Return a local time of the default time zone."""
+    return datetime(*args, tzinfo=dt_util.get_default_time_zone())
+
+
+def test_compile_daily_and_specific_days() -> None:
+    """Test daily entries apply to every day unless a day overrides them."""
+    schedule = compile_schedule(
+        {"mon": {"06:00": "eco"}, "daily": {"06:00": "comfort", "22:00": "sleep"}}
+    )
+    assert len(schedule.offsets) == 14
+    assert list(schedule.offsets) == sorted(schedule.offsets)
+    assert schedule.presets[:2] == ("eco", "sleep")
+    assert schedule.presets[2:4] == ("comfort", "sleep")
+
+
+@pytest.mark.parametrize(
+    "schedule",
+    [
+        ["mon"],
+        {"someday": {"06:00": "eco"}},
+        {"mon": ["06:00"]},
+        {"mon": {"25:00": "eco"}},
+    ],
+)
+def test_compile_invalid(schedule: object) -> None:
+    """Test invalid schedules raise ValueError."""
+    with pytest.raises(ValueError):
+        compile_schedule(schedule)
+
+
+async def test_next_transition(hass: HomeAssistant) -> None:
+    """Test the next transition is found within the week and across weeks."""
+    schedule = compile_schedule({"mon": {"06:00": "comfort"}, "fri": {"22:00": "eco"}})
+
+    # Monday 2025-01-06
+    when, preset = next_transition(schedule, dt_util.as_utc(_local(2025, 1, 6, 5)))
+    assert (when, preset) == (dt_util.as_utc(_local(2025, 1, 6, 6)), "comfort")
+
+    when, preset = next_transition(schedule, dt_util.as_utc(_local(2025, 1, 6, 6)))
+    assert (when, preset) == (dt_util.as_utc(_local(2025, 1, 10, 22)), "eco")
+
+    when, preset = next_transition(schedule, dt_util.as_utc(_local(2025, 1, 11, 0)))
+    assert (when, preset) == (dt_util.as_utc(_local(2025, 1, 13, 6)), "comfort")
+
+
+async def test_active_preset(hass: HomeAssistant) -> None:
+    """Test the active preset is the one of the last transition, across weeks."""
+    schedule = compile_schedule({"mon": {"06:00": "comfort"}, "fri": {"22:00": "eco"}})
+
+    # Monday 2025-01-06
+    assert active_preset(schedule, dt_util.as_utc(_local(2025, 1, 6, 5))) == "eco"
+    assert active_preset(schedule, dt_util.as_utc(_local(2025, 1, 6, 6))) == "comfort"
+    assert active_preset(schedule, dt_util.as_utc(_local(2025, 1, 10, 23))) == "eco"
+
+
+async def test_next_transition_dst_gap(hass: HomeAssistant) -> None:
+    """Test a transition inside a daylight saving time gap fires once per week."""
+    await hass.config.async_set_time_zone("Europe/Berlin")
+    schedule = compile_schedule({"sun": {"02:30": "eco"}})
+
+    # Clocks go forward from 02:00 to 03:00 on Sunday 2025-03-30
+    after = dt_util.as_utc(_local(2025, 3, 30, 1))
+    when, _ = next_transition(schedule, after)
+    assert after < when < dt_util.as_utc(_local(2025, 3, 30, 4))
+
+    when_next, _ = next_transition(schedule, when)
+    assert when_next == dt_util.as_utc(_local(2025, 4, 6, 2, 30))
+
+
+async def test_engine_runs_actions(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the engine applies transitions and stops after removal."""
+    freezer.move_to(dt_util.as_utc(_local(2025, 1, 6, 5, 59)))
+    engine = ScheduleEngine(hass)
+    calls_a: list[str] = []
+    calls_b: list[str] = []
+    remove_a = engine.async_add(
+        compile_schedule({"daily": {"06:00": "comfort"}}), calls_a.append
+    )
+    remove_b = engine.async_add(
+        compile_schedule({"daily": {"06:00": "eco", "07:00": "away"}}), calls_b.append
+    )
+
+    freezer.tick(timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert calls_a == ["comfort"]
+    assert calls_b == ["eco"]
+
+    remove_b()
+    freezer.tick(timedelta(days=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert calls_a == ["comfort", "comfort"]
+    assert calls_b == ["eco"]
+
+    # Removing the last schedule also cancels the timer
+    remove_a()
+
+
+async def test_engine_late_timer(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a late timer only applies the transition in effect now."""
+    freezer.move_to(dt_util.as_utc(_local(2025, 1, 6, 5, 59)))
+    engine = ScheduleEngine(hass)
+    calls: list[str] = []
+    remove = engine.async_add(
+        compile_schedule(
+            {"daily": {"06:00": "comfort", "08:00": "away", "17:00": "comfort"}}
+        ),
+        calls.append,
+    )
+
+    # Suspended for two days, resumed in the morning
+    freezer.move_to(dt_util.as_utc(_local(2025, 1, 8, 9)))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert calls == ["away"]
+
+    freezer.move_to(dt_util.as_utc(_local(2025, 1, 8, 17)))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert calls == ["away", "comfort"]
+    remove()
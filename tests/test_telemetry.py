@@ -0,0 +1,182 @@
+"""Tests for the live controller telemetry."""
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+)
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.thermostatvalvecontroller.const import DOMAIN
+from custom_components.thermostatvalvecontroller.telemetry import (
+    TELEMETRY_FIELDS,
+    TelemetryHub,
+    TelemetrySubscription,
+)
+
+from . import ENTITY_ID, SENSOR, VALVE
+from .conftest import SetupThermostat
+
+
+class FakeController:
+    """A controller publishing snapshots to the hub."""
+
+    def __init__(self, hub: TelemetryHub, entity_id: str) -> None:
+        """Initialize the controller."""
+        self.values = dict.fromkeys(TELEMETRY_FIELDS)
+        self.entity_id = entity_id
+        self.hub = hub
+        self.remove = hub.async_register(entity_id, lambda: dict(self.values))
+
+    def set(self, **values: Any) -> None:
+        """Change some fields and publish the snapshot."""
+        self.values.update(values)
+        self.hub.async_publish(self.entity_id)
+
+
+async def test_subscription_deltas(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test snapshots are throttled, coalesced and sent as deltas."""
+    hub = TelemetryHub()
+    living_room = FakeController(hub, "climate.living_room")
+    kitchen = FakeController(hub, "climate.kitchen")
+    messages: list[dict] = []
+    unsubscribe = hub.async_subscribe(
+        TelemetrySubscription(
+            hass, messages.append, None, ["current_temperature", "result"], 1.0
+        )
+    )
+
+    # The first message holds the selected fields of all controllers
+    assert messages == [
+        {
+            "controllers": {
+                "climate.living_room": {"current_temperature": None, "result": None},
+                "climate.kitchen": {"current_temperature": None, "result": None},
+            }
+        }
+    ]
+
+    # Changes within the interval are combined into one message
+    for temperature in (20.0, 20.1, 20.2):
+        living_room.set(current_temperature=temperature)
+    kitchen.set(result="written", target_temperature=21.0)
+    living_room.set(hvac_mode=HVACMode.HEAT)
+    assert len(messages) == 1
+
+    freezer.tick(timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    assert messages[1] == {
+        "controllers": {
+            "climate.living_room": {"current_temperature": 20.2},
+            "climate.kitchen": {"result": "written"},
+        }
+    }
+
+    # Unselected fields do not produce a message
+    freezer.tick(timedelta(seconds=1))
+    living_room.set(hvac_mode=HVACMode.OFF)
+    assert len(messages) == 2
+
+    kitchen.remove()
+    freezer.tick(timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    assert messages[2] == {"controllers": {"climate.kitchen": None}}
+
+    unsubscribe()
+    living_room.set(current_temperature=21.0)
+    freezer.tick(timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    assert len(messages) == 3
+
+
+async def test_subscription_entity_filter(hass: HomeAssistant) -> None:
+    """Test a subscriber only receives the controllers it asked for."""
+    hub = TelemetryHub()
+    living_room = FakeController(hub, "climate.living_room")
+    kitchen = FakeController(hub, "climate.kitchen")
+    messages: list[dict] = []
+    unsubscribe = hub.async_subscribe(
+        TelemetrySubscription(hass, messages.append, ["climate.kitchen"], None, 0.1)
+    )
+    assert list(messages[0]["controllers"]) == ["climate.kitchen"]
+
+    living_room.remove()
+    kitchen.set(result="off")
+    await hass.async_block_till_done()
+    unsubscribe()
+    assert all(
+        "climate.living_room" not in message["controllers"] for message in messages
+    )
+
+
+async def test_websocket_subscribe(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+    setup_thermostat: SetupThermostat,
+) -> None:
+    """Test subscribing to a controller over the websocket API."""
+    async_mock_service(hass, "input_number", "set_value")
+    hass.states.async_set(SENSOR, "20.0")
+    hass.states.async_set(VALVE, "0")
+    await setup_thermostat()
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {
+            "type": f"{DOMAIN}/subscribe",
+            "fields": ["raw_temperature", "current_temperature", "result"],
+            "min_interval": 5,
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+
+    msg = await client.receive_json()
+    assert msg["event"] == {
+        "controllers": {
+            ENTITY_ID: {
+                "raw_temperature": "20.0",
+                "current_temperature": 20.0,
+                "result": "unchanged",
+            }
+        }
+    }
+
+    hass.states.async_set(SENSOR, "19.5")
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    msg = await client.receive_json()
+    assert msg["event"] == {
+        "controllers": {
+            ENTITY_ID: {
+                "raw_temperature": "19.5",
+                "current_temperature": 19.5,
+                "result": "off",
+            }
+        }
+    }
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_websocket_min_interval_floor(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test subscribers cannot ask for a shorter interval than the minimum."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": f"{DOMAIN}/subscribe", "min_interval": 0})
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "invalid_format"
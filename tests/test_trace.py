@@ -0,0 +1,155 @@
+"""Tests for the decision trace."""
+
+import pytest
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.climate import (
+    DOMAIN as CLIMATE_DOMAIN,
+)
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.thermostatvalvecontroller.const import (
+    ATTR_COUNT,
+    DOMAIN,
+    SERVICE_DUMP_TRACE,
+)
+from custom_components.thermostatvalvecontroller.trace import (
+    TRACE_FIELDS,
+    DecisionTrace,
+    TraceResult,
+)
+
+from . import ENTITY_ID, SENSOR, VALVE
+from .conftest import SetupThermostat
+
+# 2025-01-06T00:00:00+00:00
+START = 1736121600.0
+
+
+def _record(trace: DecisionTrace, second: int, preset: str | None = None) -> None:
+    """Record a decision at the given second after START."""
+    trace.record(
+        START + second,
+        second % 2 == 0,
+        20.0 + second,
+        None,
+        HVACMode.HEAT,
+        preset,
+        None,
+        float(second),
+        TraceResult.WRITTEN,
+    )
+
+
+def test_record_and_export() -> None:
+    """Test a record is exported with the original values."""
+    trace = DecisionTrace(3)
+    assert len(trace) == 0
+    assert trace.export() == []
+
+    trace.record(START, True, 20.5, None, None, None, 30.0, None, TraceResult.OFF)
+    assert len(trace) == 1
+    assert trace.export() == [
+        {
+            "time": "2025-01-06T00:00:00+00:00",
+            "force": True,
+            "current_temperature": 20.5,
+            "target_temperature": None,
+            "hvac_mode": None,
+            "preset_mode": None,
+            "valve_position": 30.0,
+            "new_valve_position": None,
+            "result": TraceResult.OFF,
+        }
+    ]
+    assert list(trace.export()[0]) == list(TRACE_FIELDS)
+
+
+def test_wraparound() -> None:
+    """Test the oldest records are overwritten once the buffer is full."""
+    trace = DecisionTrace(3)
+    for second, preset in enumerate(("eco", None, "eco", "comfort", "sleep")):
+        _record(trace, second, preset)
+
+    assert len(trace) == 3
+    records = trace.export()
+    assert [record["new_valve_position"] for record in records] == [2.0, 3.0, 4.0]
+    assert [record["preset_mode"] for record in records] == [
+        "eco",
+        "comfort",
+        "sleep",
+    ]
+    assert [record["force"] for record in records] == [True, False, True]
+    assert records[-1]["time"] == "2025-01-06T00:00:04+00:00"
+
+
+@pytest.mark.parametrize(
+    ("count", "expected"), [(1, [4.0]), (2, [3.0, 4.0]), (10, [2.0, 3.0, 4.0])]
+)
+def test_export_count(count: int, expected: list[float]) -> None:
+    """Test the count returns the newest records and is clamped to the size."""
+    trace = DecisionTrace(3)
+    for second in range(5):
+        _record(trace, second)
+
+    assert [record["new_valve_position"] for record in trace.export(count)] == expected
+
+
+async def test_dump_trace(
+    hass: HomeAssistant, setup_thermostat: SetupThermostat
+) -> None:
+    """Test the dump_trace action returns the decisions of a thermostat."""
+    async_mock_service(hass, "input_number", "set_value")
+    hass.states.async_set(SENSOR, "19.0")
+    hass.states.async_set(VALVE, "0")
+    await setup_thermostat()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_HVAC_MODE: HVACMode.HEAT},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_TEMPERATURE: 21},
+        blocking=True,
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_DUMP_TRACE,
+        {ATTR_ENTITY_ID: ENTITY_ID},
+        blocking=True,
+        return_response=True,
+    )
+    records = response[ENTITY_ID]["records"]
+    assert len(records) == 3
+    assert records[1]["hvac_mode"] == HVACMode.HEAT
+    assert records[1]["result"] == TraceResult.UNCHANGED
+    assert records[2] | {"time": None} == {
+        "time": None,
+        "force": True,
+        "current_temperature": 19.0,
+        "target_temperature": 21.0,
+        "hvac_mode": HVACMode.HEAT,
+        "preset_mode": "none",
+        "valve_position": 0.0,
+        "new_valve_position": 100.0,
+        "result": TraceResult.WRITTEN,
+    }
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_DUMP_TRACE,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_COUNT: 1},
+        blocking=True,
+        return_response=True,
+    )
+    assert response[ENTITY_ID]["records"] == records[2:]